@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Compressed, append-only archive segments for cold reservations."""
+
+import gzip
+import json
+import lzma
+import os
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Set
+from src import storage
+
+
+COMPRESSORS = {
+    "gz": gzip.open,
+    "xz": lzma.open,
+}
+
+
+class ReservationArchive:
+    """Date-partitioned NDJSON segments holding archived reservations.
+
+    Each call to `append` adds a new compressed member to the segment of
+    the given day, so existing data is never rewritten. Both gzip and lzma
+    readers transparently decode concatenated members.
+
+    Next to each segment a plain `<segment>.ids` file lists the ids it
+    holds, one per line, so `find` only decompresses the segment that has
+    the record. Ids are appended before their records: the list may name
+    a record that never made it into the segment, never the other way.
+    """
+
+    ARCHIVE_DIR = "archive"
+    COMPRESSION = "gz"
+    PREFIX = "reservations-"
+    IDS_SUFFIX = ".ids"
+
+    @staticmethod
+    def directory() -> Optional[str]:
+        """Return the archive directory of the active backend, or None."""
+        root = storage.data_dir()
+        if root is None:
+            return None
+        return os.path.join(root, ReservationArchive.ARCHIVE_DIR)
+
+    @staticmethod
+    def segment_path(day: Optional[date] = None,
+                     compression: Optional[str] = None) -> str:
+        """Return the segment path for `day` (today by default)."""
+        day = day or date.today()
+        compression = compression or ReservationArchive.COMPRESSION
+        if compression not in COMPRESSORS:
+            raise ValueError(f"Unknown compression '{compression}'.")
+        filename = (
+            f"{ReservationArchive.PREFIX}{day.isoformat()}"
+            f".ndjson.{compression}"
+        )
+        return os.path.join(ReservationArchive.directory(), filename)
+
+    @staticmethod
+    def append(records: List[Dict], day: Optional[date] = None,
+               compression: Optional[str] = None) -> int:
+        """Append `records` to the day's segment; return how many."""
+        if not records:
+            return 0
+        compression = compression or ReservationArchive.COMPRESSION
+        path = ReservationArchive.segment_path(day, compression)
+        os.makedirs(ReservationArchive.directory(), exist_ok=True)
+        with open(ReservationArchive.ids_path(path), "a",
+                  encoding="utf-8") as f:
+            for record in records:
+                f.write(f"{record['reservation_id']}\n")
+        with COMPRESSORS[compression](path, "at", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+        return len(records)
+
+    @staticmethod
+    def ids_path(segment: str) -> str:
+        """Return the path of the id list kept next to `segment`."""
+        return segment + ReservationArchive.IDS_SUFFIX
+
+    @staticmethod
+    def segment_ids(segment: str) -> Optional[Set[str]]:
+        """Return the ids listed for `segment`, or None without a list."""
+        try:
+            with open(ReservationArchive.ids_path(segment), "r",
+                      encoding="utf-8") as f:
+                return {line.strip() for line in f if line.strip()}
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def segments() -> List[str]:
+        """Return all segment paths, newest partition first."""
+        directory = ReservationArchive.directory()
+        if directory is None or not os.path.isdir(directory):
+            return []
+        names = [
+            name
+            for name in os.listdir(directory)
+            if name.startswith(ReservationArchive.PREFIX)
+            and name.rsplit(".", 1)[-1] in COMPRESSORS
+        ]
+        return [
+            os.path.join(directory, name)
+            for name in sorted(names, reverse=True)
+        ]
+
+    @staticmethod
+    def iter_segment(path: str) -> Iterator[Dict]:
+        """Yield the records stored in one segment, in append order."""
+        opener = COMPRESSORS[path.rsplit(".", 1)[-1]]
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    @staticmethod
+    def iter_records() -> Iterator[Dict]:
+        """Yield every archived record, newest partition first."""
+        for path in ReservationArchive.segments():
+            yield from ReservationArchive.iter_segment(path)
+
+    @staticmethod
+    def find(reservation_id: str) -> Optional[Dict]:
+        """Return the archived record for `reservation_id`, or None.
+
+        Only segments whose id list names the reservation are read;
+        segments written before id lists existed are always scanned.
+        """
+        reservation_id = str(reservation_id)
+        for path in ReservationArchive.segments():
+            ids = ReservationArchive.segment_ids(path)
+            if ids is not None and reservation_id not in ids:
+                continue
+            for record in ReservationArchive.iter_segment(path):
+                if record.get("reservation_id") == reservation_id:
+                    return record
+        return None
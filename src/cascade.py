@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Release the reservations that depend on deleted customers or hotels."""
+
+from typing import Dict, Iterable, List, Set, Tuple
+from src import waitlist
+from src.archive import ReservationArchive
+from src.file_db import FileDB
+
+
+def find_dependents(reservations: Dict, customer_ids: Set[str],
+                    hotel_ids: Set[str]) -> List[Dict]:
+    """Return the reservation records held by any of the given owners.
+
+    One pass over `reservations` serves the whole batch of ids. Waitlisted
+    records come first, so the batch leaves the queues before any room it
+    frees is handed to them and none of its own bookings is promoted.
+    """
+    dependents = [
+        data
+        for data in reservations.values()
+        if data["customer_id"] in customer_ids
+        or data["hotel_id"] in hotel_ids
+    ]
+    dependents.sort(key=lambda data: data.get("status") != "waitlisted")
+    return dependents
+
+
+def release_room(reservations: Dict, waitlists: Dict, hotels: Dict,
+                 hotel_id: str) -> str:
+    """Give a freed room at `hotel_id` to its waitlist, else to `hotels`.
+
+    Returns "waitlist" or "hotels" for whichever was modified, or "" if
+    the hotel no longer exists.
+    """
+    if hotel_id in waitlists and \
+            waitlist.promote(reservations, waitlists, hotel_id):
+        return "waitlist"
+    if hotel_id not in hotels:
+        return ""
+    hotel = hotels[hotel_id]
+    hotel["available_rooms"] = min(
+        hotel["total_rooms"], hotel["available_rooms"] + 1
+    )
+    return "hotels"
+
+
+def release_one(data: Dict, reservations: Dict, waitlists: Dict,
+                hotels: Dict, deleted_hotels: Set[str]) -> Set[str]:
+    """Cancel reservation `data` and release whatever it was holding.
+
+    A waitlisted booking leaves its queue; an active one frees its room
+    unless the hotel itself is being deleted. Returns the names of the
+    modified mappings ("waitlist", "hotels").
+    """
+    status = data.get("status", "active")
+    data["status"] = "cancelled"
+    if status == "waitlisted":
+        if waitlist.remove(waitlists, data["hotel_id"],
+                           data["reservation_id"]):
+            return {"waitlist"}
+    elif status == "active" and data["hotel_id"] not in deleted_hotels:
+        return {release_room(reservations, waitlists, hotels,
+                             data["hotel_id"])}
+    return set()
+
+
+def release_dependents(hotels: Dict, customer_ids: Iterable[str] = (),
+                       hotel_ids: Iterable[str] = (),
+                       archive: bool = False) -> Tuple[int, bool]:
+    """Cancel, or archive, every reservation of the given owners.
+
+    The reservations table is loaded, scanned and rewritten once for the
+    whole batch, so a batch costs about as much as a single delete; with
+    one JSON file per table there is no cheaper way to change a subset.
+    Rooms of released active reservations go to the head of the hotel's
+    waitlist, or back to `hotels`, which the caller persists. Waitlists of
+    deleted hotels are dropped. Reservations, waitlists and the archive
+    are each written at most once.
+
+    Returns (released reservations, whether `hotels` was modified).
+    """
+    customer_ids = {str(i) for i in customer_ids}
+    hotel_ids = {str(i) for i in hotel_ids}
+    reservations = FileDB.load_reservations_data()
+    dependents = find_dependents(reservations, customer_ids, hotel_ids)
+    if not dependents:
+        return 0, False
+    if archive and ReservationArchive.directory() is None:
+        print("Error: The active storage backend has no archive.")
+        archive = False
+
+    waitlists = FileDB.load_waitlist_data()
+    modified = set()
+    released = 0
+    for data in dependents:
+        if archive or data.get("status", "active") != "cancelled":
+            released += 1
+        modified |= release_one(data, reservations, waitlists, hotels,
+                                hotel_ids)
+
+    for hotel_id in hotel_ids:
+        if waitlists.pop(hotel_id, None) is not None:
+            modified.add("waitlist")
+
+    if archive:
+        ReservationArchive.append(dependents)
+        for data in dependents:
+            del reservations[data["reservation_id"]]
+    if released:
+        FileDB.save_reservations_data(reservations)
+    if "waitlist" in modified:
+        FileDB.save_waitlist_data(waitlists)
+    return released, "hotels" in modified
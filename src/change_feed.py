@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""Append-only change log emitted by FileDB saves."""
+
+import fcntl
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+from src import storage
+
+
+Change = Tuple[str, str, Optional[Dict]]
+
+
+def diff_tables(old: Dict, new: Dict) -> List[Change]:
+    """Return (op, key, record) tuples turning mapping `old` into `new`."""
+    changes = [
+        ("upsert", key, record)
+        for key, record in new.items()
+        if old.get(key) != record
+    ]
+    changes.extend(
+        ("delete", key, None) for key in old if key not in new
+    )
+    return changes
+
+
+class ChangeFeed:
+    """Per-record change log with a monotonic sequence number.
+
+    Every change is one NDJSON line carrying `seq`, `table`, `op`, `key`
+    and `record`. A "reset" change means the whole table was replaced and
+    must be reloaded. Subscribers remember the byte offset they have read
+    up to and only stat the log until it grows again.
+
+    Writers hold `ChangeFeed.lock()` across the table save and `record`,
+    so sequence numbers are unique and in log order across processes.
+    Backends without a data directory have no feed: readers see it empty.
+    """
+
+    CHANGES_FILE = "changes.ndjson"
+    SEQUENCE_FILE = "changes.seq"
+    LOCK_FILE = "changes.lock"
+
+    @staticmethod
+    def _path(filename: str) -> Optional[str]:
+        """Return `filename` inside the active data directory, or None."""
+        root = storage.data_dir()
+        if root is None:
+            return None
+        return os.path.join(root, filename)
+
+    @staticmethod
+    def changes_path() -> Optional[str]:
+        """Return the change log path, or None without a data directory."""
+        return ChangeFeed._path(ChangeFeed.CHANGES_FILE)
+
+    @staticmethod
+    def sequence_path() -> Optional[str]:
+        """Return the sequence file path, or None without a data directory."""
+        return ChangeFeed._path(ChangeFeed.SEQUENCE_FILE)
+
+    @staticmethod
+    @contextmanager
+    def lock() -> Iterator:
+        """Hold the exclusive writer lock of the active data directory.
+
+        Raises RuntimeError when the active backend has no data directory.
+        """
+        path = ChangeFeed._path(ChangeFeed.LOCK_FILE)
+        if path is None:
+            raise RuntimeError(
+                "The active storage backend has no change feed."
+            )
+        with open(path, "a", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    @staticmethod
+    def last_sequence() -> int:
+        """Return the sequence number of the newest change, or 0."""
+        path = ChangeFeed.sequence_path()
+        if path is None or not os.path.exists(path):
+            return 0
+        with open(path, "r", encoding="utf-8") as f:
+            return int(f.read().strip() or 0)
+
+    @staticmethod
+    def record(table: str, old: Dict, new: Dict) -> int:
+        """Append the changes between `old` and `new`; return the last seq.
+
+        The caller must hold `ChangeFeed.lock()`.
+        """
+        return ChangeFeed._append([
+            {"table": table, "op": op, "key": key, "record": record}
+            for op, key, record in diff_tables(old, new)
+        ])
+
+    @staticmethod
+    def record_reset(table: str) -> int:
+        """Append one "reset" change for `table`; return its seq.
+
+        Used by bulk writers instead of one change per record. The caller
+        must hold `ChangeFeed.lock()`.
+        """
+        return ChangeFeed._append([
+            {"table": table, "op": "reset", "key": None, "record": None}
+        ])
+
+    @staticmethod
+    def _append(changes: List[Dict]) -> int:
+        """Number and append `changes`, then publish the new last seq."""
+        seq = ChangeFeed.last_sequence()
+        if not changes:
+            return seq
+
+        lines = []
+        for change in changes:
+            seq += 1
+            lines.append(json.dumps({"seq": seq, **change}) + "\n")
+        changes_path = ChangeFeed.changes_path()
+        sequence_path = ChangeFeed.sequence_path()
+        if changes_path is None:
+            raise RuntimeError(
+                "The active storage backend has no change feed."
+            )
+        with open(changes_path, "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+        tmp_path = f"{sequence_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(str(seq))
+        os.replace(tmp_path, sequence_path)
+        return seq
+
+    @staticmethod
+    def read(offset: int = 0) -> Tuple[List[Dict], int]:
+        """Return the changes written after byte `offset` and the new offset.
+
+        A trailing line that is still being written is left for next time.
+        """
+        path = ChangeFeed.changes_path()
+        if path is None or not os.path.exists(path):
+            return [], offset
+        with open(path, "rb") as f:
+            f.seek(offset)
+            chunk = f.read()
+        complete = chunk[:chunk.rfind(b"\n") + 1]
+        changes = [
+            json.loads(line)
+            for line in complete.decode("utf-8").splitlines()
+            if line.strip()
+        ]
+        return changes, offset + len(complete)
+
+    @staticmethod
+    def size() -> int:
+        """Return the current size of the change log in bytes."""
+        path = ChangeFeed.changes_path()
+        if path is None:
+            return 0
+        try:
+            return os.stat(path).st_size
+        except FileNotFoundError:
+            return 0
+
+    @staticmethod
+    def follow(since: int = 0, poll_interval: float = 0.5,
+               timeout: Optional[float] = None) -> Iterator[Dict]:
+        """Yield changes with `seq` greater than `since` as they arrive.
+
+        Stops once no new change has arrived for `timeout` seconds, or
+        never when `timeout` is None.
+        """
+        offset = 0
+        idle_since = time.monotonic()
+        while True:
+            if ChangeFeed.size() > offset:
+                changes, offset = ChangeFeed.read(offset)
+                for change in changes:
+                    if change["seq"] > since:
+                        since = change["seq"]
+                        idle_since = time.monotonic()
+                        yield change
+            elif ChangeFeed.size() < offset:
+                offset = 0
+            if timeout is not None and \
+                    time.monotonic() - idle_since >= timeout:
+                return
+            time.sleep(poll_interval)
+
+    @staticmethod
+    def apply(tables: Dict[str, Dict], change: Dict):
+        """Apply one `change` to an in-memory mapping of tables.
+
+        "reset" changes carry no data; subscribers reload the table.
+        """
+        table = tables.setdefault(change["table"], {})
+        if change["op"] == "reset":
+            return
+        if change["op"] == "delete":
+            table.pop(change["key"], None)
+        else:
+            table[change["key"]] = change["record"]
@@ -2,6 +2,7 @@
 """Customer class with simple file-based persistence using FileDB."""
 
 from dataclasses import dataclass
+from src.cascade import release_dependents
 from src.file_db import FileDB
 
 
@@ -81,21 +82,43 @@ class CustomerRepository:
         return customer
 
     @staticmethod
-    def delete(customer_id):
-        """Delete a customer by id.
+    def delete(customer_id, archive=False):
+        """Delete a customer by id, cascading to its reservations.
 
         Returns True on success, False otherwise.
         """
-        customers = FileDB.load_customers_data()
-        customer_id = str(customer_id)
+        return CustomerRepository.delete_many([customer_id], archive) == 1
 
-        if customer_id not in customers:
-            print(f"Error: Customer '{customer_id}' not found.")
-            return False
-        del customers[customer_id]
+    @staticmethod
+    def delete_many(customer_ids, archive=False):
+        """Delete several customers, persisting each affected file once.
+
+        Their reservations are cancelled (or archived when `archive` is
+        True) and their rooms restored. Returns the number deleted.
+        """
+        customers = FileDB.load_customers_data()
+        found = []
+        for customer_id in map(str, customer_ids):
+            if customer_id not in customers:
+                print(f"Error: Customer '{customer_id}' not found.")
+                continue
+            if customer_id not in found:
+                found.append(customer_id)
+        if not found:
+            return 0
+
+        hotels = FileDB.load_hotels_data()
+        _, hotels_changed = release_dependents(
+            hotels, customer_ids=found, archive=archive
+        )
+        if hotels_changed:
+            FileDB.save_hotels_data(hotels)
+        for customer_id in found:
+            del customers[customer_id]
         FileDB.save_customers_data(customers)
-        print(f"Customer '{customer_id}' deleted.")
-        return True
+        for customer_id in found:
+            print(f"Customer '{customer_id}' deleted.")
+        return len(found)
 
     @staticmethod
     def modify(customer_id, name=None, email=None, phone=None):
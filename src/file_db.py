@@ -1,76 +1,123 @@
 #!/usr/bin/env python3
-"""Generic JSON file read/write utilities for persistent storage."""
+"""High-level access to the domain tables through a storage backend."""
 
-import json
-import os
-from typing import Dict
+from contextlib import contextmanager
+from typing import Dict, Iterator
+from src import storage
+from src.change_feed import ChangeFeed
 
 
-def ensure_data_dir():
-    """Ensure the `data` directory exists for JSON files."""
-    os.makedirs("data", exist_ok=True)
+class FileDB:
+    """High-level file access for domain data files.
 
+    Tables are stored by the active backend (see `src.storage`): JSON files
+    under `data/` by default, another directory via
+    `FileDB.use_data_dir`, or memory via `FileDB.use_memory`.
+    """
 
-def read_json(filepath):
-    """Read JSON from `filepath` and return the parsed object."""
-    if not os.path.exists(filepath):
-        return {}
-    with open(filepath, "r", encoding="utf-8") as f:
-        return json.load(f)
+    TABLES = ("customers", "hotels", "reservations", "waitlist")
 
+    @staticmethod
+    def configure(backend):
+        """Make `backend` the process-wide storage backend."""
+        storage.set_backend(backend)
 
-def write_json(filepath, data):
-    """Write `data` as JSON to `filepath` with a 4-space indent."""
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
+    @staticmethod
+    def using(backend):
+        """Return a context manager using `backend` in the current context."""
+        return storage.use_backend(backend)
 
+    @staticmethod
+    def use_data_dir(root: str):
+        """Store JSON files under `root` for the whole process."""
+        FileDB.configure(storage.JsonFileBackend(root))
 
-class FileDB:
-    """High-level file access for domain data files."""
+    @staticmethod
+    def use_memory():
+        """Keep every table in memory for the whole process."""
+        FileDB.configure(storage.MemoryBackend())
+
+    @staticmethod
+    def load_table(name: str) -> Dict:
+        """Load the mapping of the table called `name`."""
+        return storage.get_backend().load(name)
 
-    CUSTOMERS_FILE = "data/customers.json"
-    HOTELS_FILE = "data/hotels.json"
-    RESERVATIONS_FILE = "data/reservations.json"
+    @staticmethod
+    def save_table(name: str, data: Dict, bulk: bool = False):
+        """Persist `data` as the mapping of the table called `name`.
+
+        The save and its change feed entries happen under the feed lock,
+        diffed against the version actually being replaced. With `bulk`
+        a single "reset" change is emitted instead of one per record.
+        """
+        backend = storage.get_backend()
+        if backend.root is None:
+            backend.save(name, data)
+            return
+        backend.ensure_root()
+        with ChangeFeed.lock():
+            if bulk:
+                backend.save(name, data)
+                ChangeFeed.record_reset(name)
+                return
+            old = backend.load_published(name)
+            backend.save(name, data)
+            ChangeFeed.record(name, old, data)
 
     @staticmethod
     def load_customers_data() -> Dict:
         """Load and return the customers JSON mapping from storage."""
-        ensure_data_dir()
-        if not os.path.exists(FileDB.CUSTOMERS_FILE):
-            return {}
-        return read_json(FileDB.CUSTOMERS_FILE)
+        return FileDB.load_table("customers")
 
     @staticmethod
     def save_customers_data(data: Dict):
         """Persist the customers mapping to storage."""
-        ensure_data_dir()
-        write_json(FileDB.CUSTOMERS_FILE, data)
+        FileDB.save_table("customers", data)
 
     @staticmethod
     def load_hotels_data() -> Dict:
         """Load and return the hotels JSON mapping from storage."""
-        ensure_data_dir()
-        if not os.path.exists(FileDB.HOTELS_FILE):
-            return {}
-        return read_json(FileDB.HOTELS_FILE)
+        return FileDB.load_table("hotels")
 
     @staticmethod
     def save_hotels_data(data: Dict):
         """Persist the hotels mapping to storage."""
-        ensure_data_dir()
-        write_json(FileDB.HOTELS_FILE, data)
+        FileDB.save_table("hotels", data)
 
     @staticmethod
     def load_reservations_data() -> Dict:
         """Load and return the reservations JSON mapping from storage."""
-        ensure_data_dir()
-        if not os.path.exists(FileDB.RESERVATIONS_FILE):
-            return {}
-        return read_json(FileDB.RESERVATIONS_FILE)
+        return FileDB.load_table("reservations")
 
     @staticmethod
     def save_reservations_data(data: Dict):
         """Persist the reservations mapping to storage."""
-        ensure_data_dir()
-        write_json(FileDB.RESERVATIONS_FILE, data)
+        FileDB.save_table("reservations", data)
+
+    @staticmethod
+    def load_waitlist_data() -> Dict:
+        """Load and return the per-hotel waitlists from storage."""
+        return FileDB.load_table("waitlist")
+
+    @staticmethod
+    def save_waitlist_data(data: Dict):
+        """Persist the per-hotel waitlists to storage."""
+        FileDB.save_table("waitlist", data)
+
+    @staticmethod
+    @contextmanager
+    def snapshot(retries: int = 10) -> Iterator:
+        """Pin the current version of every table for the `with` block.
+
+        Loads inside the block, including repository reads, see that
+        version no matter how many saves happen meanwhile; saves raise.
+        """
+        pinned = storage.get_backend().pin(FileDB.TABLES, retries)
+        with storage.use_backend(pinned):
+            yield pinned
+
+    @staticmethod
+    def load_snapshot(retries: int = 10) -> Dict[str, Dict]:
+        """Load every table as of a single point in time."""
+        with FileDB.snapshot(retries) as pinned:
+            return {name: pinned.load(name) for name in FileDB.TABLES}
@@ -3,6 +3,8 @@
 
 from dataclasses import dataclass, field
 from typing import Optional
+from src import waitlist
+from src.cascade import release_dependents
 from src.file_db import FileDB
 
 
@@ -93,18 +95,38 @@ class HotelRepository:
         return hotel
 
     @staticmethod
-    def delete(hotel_id):
-        """Delete a hotel by id. Returns True on success, False otherwise."""
-        hotels = FileDB.load_hotels_data()
-        hotel_id = str(hotel_id)
+    def delete(hotel_id, archive=False):
+        """Delete a hotel by id. Returns True on success, False otherwise.
 
-        if hotel_id not in hotels:
-            print(f"Error: Hotel '{hotel_id}' not found.")
-            return False
-        del hotels[hotel_id]
+        Its reservations are cancelled, or archived when `archive` is True.
+        """
+        return HotelRepository.delete_many([hotel_id], archive) == 1
+
+    @staticmethod
+    def delete_many(hotel_ids, archive=False):
+        """Delete several hotels, persisting each affected file once.
+
+        Their reservations are cancelled (or archived when `archive` is
+        True) and their waitlists dropped. Returns the number deleted.
+        """
+        hotels = FileDB.load_hotels_data()
+        found = []
+        for hotel_id in map(str, hotel_ids):
+            if hotel_id not in hotels:
+                print(f"Error: Hotel '{hotel_id}' not found.")
+                continue
+            if hotel_id not in found:
+                found.append(hotel_id)
+        if not found:
+            return 0
+
+        for hotel_id in found:
+            del hotels[hotel_id]
+        release_dependents(hotels, hotel_ids=found, archive=archive)
         FileDB.save_hotels_data(hotels)
-        print(f"Hotel '{hotel_id}' deleted.")
-        return True
+        for hotel_id in found:
+            print(f"Hotel '{hotel_id}' deleted.")
+        return len(found)
 
     @staticmethod
     def modify(hotel_id, name=None, location=None, total_rooms=None):
@@ -130,6 +152,8 @@ class HotelRepository:
         hotels[hotel_id] = hotel.to_dict()
         FileDB.save_hotels_data(hotels)
         print(f"Hotel '{hotel_id}' updated.")
+        if total_rooms is not None:
+            hotel.available_rooms -= HotelRepository.fill_vacancies(hotel_id)
         return hotel
 
     @staticmethod
@@ -170,4 +194,29 @@ class HotelRepository:
         hotel.available_rooms += 1
         hotels[hotel_id] = hotel.to_dict()
         FileDB.save_hotels_data(hotels)
+        HotelRepository.fill_vacancies(hotel_id)
         return True
+
+    @staticmethod
+    def fill_vacancies(hotel_id):
+        """Hand the hotel's free rooms to its waitlist, best entry first.
+
+        Called wherever rooms are added, so nobody books past the queue.
+        Returns how many waitlisted reservations were promoted.
+        """
+        hotel_id = str(hotel_id)
+        waitlists = FileDB.load_waitlist_data()
+        if hotel_id not in waitlists:
+            return 0
+        hotels = FileDB.load_hotels_data()
+        if hotels.get(hotel_id, {}).get("available_rooms", 0) <= 0:
+            return 0
+
+        reservations = FileDB.load_reservations_data()
+        promoted = waitlist.fill(reservations, waitlists, hotels[hotel_id],
+                                 hotel_id)
+        if promoted:
+            FileDB.save_reservations_data(reservations)
+            FileDB.save_hotels_data(hotels)
+        FileDB.save_waitlist_data(waitlists)
+        return promoted
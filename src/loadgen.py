@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""Booking workload generator and replayer for capacity planning.
+
+Usage:
+    python -m src.loadgen generate <trace.jsonl> [--ops N] [--hotels N]
+                                   [--rooms N] [--customers N] [--seed N]
+    python -m src.loadgen replay <trace.jsonl> [--workers N]
+                                 [--mode thread|process] [--data-dir DIR]
+
+A trace is a JSONL stream of `{"op": ..., "args": [...]}` operations.
+Operations flagged `"setup": true` run serially before the measured part.
+`reservation.cancel` and `reservation.get` without arguments act on a
+reservation created earlier by the same worker.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional
+from src import storage
+from src.customer import CustomerRepository
+from src.file_db import FileDB
+from src.hotel import HotelRepository
+from src.reconcile import count_active, find_room_mismatches
+from src.reservation import ReservationRepository
+
+
+OPERATIONS = {
+    "customer.create": CustomerRepository.create,
+    "customer.get": CustomerRepository.get,
+    "hotel.create": HotelRepository.create,
+    "hotel.get": HotelRepository.get,
+    "hotel.reserve": HotelRepository.reserve,
+    "hotel.cancel": HotelRepository.cancel,
+    "reservation.create": ReservationRepository.create,
+    "reservation.cancel": ReservationRepository.cancel,
+    "reservation.get": ReservationRepository.get,
+}
+
+DEFAULT_MIX = {
+    "reservation.create": 45,
+    "reservation.cancel": 15,
+    "reservation.get": 15,
+    "hotel.get": 15,
+    "customer.get": 10,
+}
+
+IO_STATS = ("reads", "writes", "bytes_read", "bytes_written")
+
+
+@dataclass
+class TraceShape:
+    """Size and operation mix of a generated trace."""
+
+    ops: int = 1000
+    hotels: int = 5
+    rooms: int = 20
+    customers: int = 50
+    mix: Dict[str, int] = field(default_factory=lambda: dict(DEFAULT_MIX))
+
+
+def generate_trace(shape: Optional[TraceShape] = None,
+                   seed: Optional[int] = None) -> Iterator[Dict]:
+    """Yield setup operations followed by `shape.ops` booking operations."""
+    shape = shape or TraceShape()
+    rng = random.Random(seed)
+    for i in range(1, shape.hotels + 1):
+        yield {"op": "hotel.create", "setup": True,
+               "args": [f"H{i}", f"Hotel {i}", "City", shape.rooms]}
+    for i in range(1, shape.customers + 1):
+        yield {"op": "customer.create", "setup": True,
+               "args": [f"C{i}", f"Customer {i}", f"c{i}@test.com", "555"]}
+
+    names = list(shape.mix)
+    weights = [shape.mix[name] for name in names]
+    for _ in range(shape.ops):
+        name = rng.choices(names, weights)[0]
+        customer_id = f"C{rng.randint(1, shape.customers)}"
+        hotel_id = f"H{rng.randint(1, shape.hotels)}"
+        if name == "reservation.create":
+            args = [customer_id, hotel_id]
+        elif name.startswith("customer."):
+            args = [customer_id]
+        elif name.startswith("hotel."):
+            args = [hotel_id]
+        else:
+            args = []
+        yield {"op": name, "args": args}
+
+
+def read_trace(path: str) -> Iterator[Dict]:
+    """Yield the operations stored in the JSONL trace at `path`."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def write_trace(path: str, operations: Iterable[Dict]) -> int:
+    """Write `operations` to `path` as JSONL; return how many."""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for operation in operations:
+            f.write(json.dumps(operation) + "\n")
+            count += 1
+    return count
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Return the nearest-rank `pct` percentile of `sorted_values`."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def run_operation(operation: Dict, created: List[str]) -> bool:
+    """Execute one trace operation; return whether it succeeded."""
+    name = operation["op"]
+    args = list(operation.get("args", []))
+    if name in ("reservation.cancel", "reservation.get") and not args:
+        if not created:
+            return False
+        args = [created.pop() if name == "reservation.cancel"
+                else created[-1]]
+    result = OPERATIONS[name](*args)
+    if name == "reservation.create" and result is not None:
+        created.append(result.reservation_id)
+    return bool(result)
+
+
+@contextlib.contextmanager
+def quiet() -> Iterator:
+    """Silence the repositories' progress messages inside the block."""
+    with open(os.devnull, "w", encoding="utf-8") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        yield
+
+
+def run_worker(operations: List[Dict]) -> Dict:
+    """Run `operations` in order and collect latency and outcome counts."""
+    latencies, errors, rejected, created = [], 0, 0, []
+    for operation in operations:
+        start = time.perf_counter()
+        try:
+            if not run_operation(operation, created):
+                rejected += 1
+        except Exception:  # pylint: disable=broad-exception-caught
+            errors += 1
+        latencies.append(time.perf_counter() - start)
+    return {"latencies": latencies, "errors": errors, "rejected": rejected}
+
+
+def _process_worker(operations: List[Dict], data_dir: str) -> Dict:
+    """Run a worker in a child process and report its own FileDB I/O."""
+    FileDB.use_data_dir(data_dir)
+    with quiet():
+        result = run_worker(operations)
+    result["io"] = dict(storage.get_backend().stats)
+    return result
+
+
+def count_overbooked() -> int:
+    """Return how many active reservations exceed their hotel's rooms."""
+    snapshot = FileDB.load_snapshot()
+    active = count_active(snapshot["reservations"].values())
+    return sum(
+        max(0, active[hotel_id] - int(data["total_rooms"]))
+        for hotel_id, data in snapshot["hotels"].items()
+    )
+
+
+def summarize(run: Dict, results: List[Dict]) -> Dict:
+    """Return the report of `run` given its per-worker `results`.
+
+    `run` holds operations, workers, mode, elapsed_s and io; latency
+    percentiles, outcome counts and the data checks are added to it.
+    """
+    latencies = sorted(t for r in results for t in r["latencies"])
+    elapsed = run["elapsed_s"]
+    report = dict(run)
+    report.update({
+        "throughput_ops_s": run["operations"] / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "errors": sum(r["errors"] for r in results),
+        "rejected": sum(r["rejected"] for r in results),
+        "overbooked": count_overbooked(),
+        "room_count_drift": len(find_room_mismatches()),
+    })
+    return report
+
+
+def replay(operations: Iterable[Dict], data_dir: str, workers: int = 1,
+           mode: str = "thread") -> Dict:
+    """Replay a trace against a FileDB rooted at `data_dir`.
+
+    The process-wide FileDB backend is switched to `data_dir` for the run,
+    so worker threads share it, and switched back afterwards. Measured
+    operations are dealt round-robin to `workers` threads or processes.
+    Returns the run report.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1.")
+    if mode not in ("thread", "process"):
+        raise ValueError(f"Unknown mode '{mode}'.")
+    previous = storage.get_backend()
+    FileDB.use_data_dir(data_dir)
+    try:
+        return _replay_trace(operations, data_dir, workers, mode)
+    finally:
+        FileDB.configure(previous)
+
+
+def _replay_trace(operations: Iterable[Dict], data_dir: str, workers: int,
+                  mode: str) -> Dict:
+    """Run a validated replay against the already active backend."""
+    backend = storage.get_backend()
+
+    setup, measured = [], []
+    for operation in operations:
+        (setup if operation.get("setup") else measured).append(operation)
+    shares = [measured[i::workers] for i in range(workers)]
+    with quiet():
+        run_worker(setup)
+        before = dict(backend.stats)
+        start = time.perf_counter()
+        if mode == "thread":
+            with ThreadPoolExecutor(workers) as pool:
+                results = list(pool.map(run_worker, shares))
+            io = {k: backend.stats[k] - before[k] for k in IO_STATS}
+        else:
+            with ProcessPoolExecutor(workers) as pool:
+                results = list(pool.map(_process_worker, shares,
+                                        [data_dir] * workers))
+            io = {k: sum(r["io"][k] for r in results) for k in IO_STATS}
+        elapsed = time.perf_counter() - start
+
+    return summarize({"operations": len(measured), "workers": workers,
+                      "mode": mode, "elapsed_s": elapsed, "io": io}, results)
+
+
+def print_report(report: Dict):
+    """Print a replay report in a human readable form."""
+    print(f"{report['operations']} operations, {report['workers']} "
+          f"{report['mode']} worker(s), {report['elapsed_s']:.3f}s")
+    print(f"throughput: {report['throughput_ops_s']:.1f} ops/s")
+    print(f"latency ms: p50 {report['p50_ms']:.3f}  "
+          f"p95 {report['p95_ms']:.3f}  p99 {report['p99_ms']:.3f}")
+    print(f"errors: {report['errors']}  rejected: {report['rejected']}  "
+          f"overbooked: {report['overbooked']}  "
+          f"room count drift: {report['room_count_drift']}")
+    io = report["io"]
+    print(f"FileDB I/O: {io['reads']} reads ({io['bytes_read']} bytes), "
+          f"{io['writes']} writes ({io['bytes_written']} bytes)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the load generator command line; return the exit status."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    gen_cmd = commands.add_parser("generate", help="write a random trace")
+    gen_cmd.add_argument("trace")
+    gen_cmd.add_argument("--ops", type=int, default=1000)
+    gen_cmd.add_argument("--hotels", type=int, default=5)
+    gen_cmd.add_argument("--rooms", type=int, default=20)
+    gen_cmd.add_argument("--customers", type=int, default=50)
+    gen_cmd.add_argument("--seed", type=int)
+    replay_cmd = commands.add_parser("replay", help="replay a trace")
+    replay_cmd.add_argument("trace")
+    replay_cmd.add_argument("--workers", type=int, default=1)
+    replay_cmd.add_argument("--mode", choices=("thread", "process"),
+                            default="thread")
+    replay_cmd.add_argument("--data-dir",
+                            help="scratch data directory (default: temp)")
+    replay_cmd.add_argument("--json", action="store_true",
+                            help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        shape = TraceShape(args.ops, args.hotels, args.rooms,
+                           args.customers)
+        count = write_trace(args.trace, generate_trace(shape, args.seed))
+        print(f"{count} operations written to '{args.trace}'.")
+        return 0
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="loadgen-")
+    try:
+        report = replay(read_trace(args.trace), data_dir, args.workers,
+                        args.mode)
+    finally:
+        if args.data_dir is None:
+            shutil.rmtree(data_dir, ignore_errors=True)
+    if args.json:
+        print(json.dumps(report, indent=4))
+    else:
+        print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Consistency check and repair for denormalized hotel room counts.
+
+Usage:
+    python -m src.reconcile [--repair]
+"""
+
+import argparse
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+from src.file_db import FileDB
+from src.hotel import HotelRepository
+
+
+def count_active(reservations: Iterable[Dict]) -> Counter:
+    """Return the number of active reservations per hotel id."""
+    return Counter(
+        str(data["hotel_id"])
+        for data in reservations
+        if data.get("status", "active") == "active"
+    )
+
+
+def recorded_rooms(hotel: Dict) -> int:
+    """Return the `available_rooms` stored in hotel record `hotel`."""
+    return int(hotel.get("available_rooms", hotel["total_rooms"]))
+
+
+def compare_room_counts(hotels: Dict, reservations: Dict) -> List[Dict]:
+    """Return the hotels in `hotels` whose room count is off.
+
+    Each mismatch reports the recorded value, the expected value and
+    whether the hotel is overbooked (more active reservations than rooms).
+    """
+    active = count_active(reservations.values())
+    mismatches = []
+    for hotel_id, data in hotels.items():
+        total = int(data["total_rooms"])
+        recorded = recorded_rooms(data)
+        expected = max(0, total - active[hotel_id])
+        if recorded != expected:
+            mismatches.append({
+                "hotel_id": hotel_id,
+                "recorded": recorded,
+                "expected": expected,
+                "overbooked": active[hotel_id] > total,
+            })
+    return mismatches
+
+
+def find_room_mismatches() -> List[Dict]:
+    """Return hotels whose `available_rooms` disagrees with reservations.
+
+    Both tables come from one consistent snapshot and are scanned once.
+    """
+    snapshot = FileDB.load_snapshot()
+    return compare_room_counts(snapshot["hotels"], snapshot["reservations"])
+
+
+def repair_room_counts(mismatches: Optional[List[Dict]] = None) -> int:
+    """Fix every mismatching hotel in one write; return how many changed.
+
+    Expected counts are computed from one snapshot; only the changed
+    `available_rooms` values are then applied to the hotels table loaded
+    right before the save, so hotels written since the snapshot are kept.
+    A hotel is skipped unless it still shows the count found to be wrong.
+    When `mismatches` from an earlier check is given, only those hotels
+    are repaired, and only if their count is still the one reported.
+    Rooms found free go to the hotel's waitlist first.
+    """
+    snapshot = FileDB.load_snapshot()
+    current = compare_room_counts(snapshot["hotels"],
+                                  snapshot["reservations"])
+    if mismatches is not None:
+        reported = {m["hotel_id"]: m["recorded"] for m in mismatches}
+        current = [m for m in current
+                   if reported.get(m["hotel_id"]) == m["recorded"]]
+    hotels = FileDB.load_hotels_data()
+    repaired = []
+    for mismatch in current:
+        hotel = hotels.get(mismatch["hotel_id"])
+        if hotel is None or recorded_rooms(hotel) != mismatch["recorded"]:
+            continue
+        hotel["available_rooms"] = mismatch["expected"]
+        repaired.append(mismatch)
+    if repaired:
+        FileDB.save_hotels_data(hotels)
+    for mismatch in repaired:
+        if mismatch["expected"] > mismatch["recorded"]:
+            HotelRepository.fill_vacancies(mismatch["hotel_id"])
+    return len(repaired)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Report room count mismatches; return 1 if any remain unrepaired."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repair", action="store_true",
+                        help="write the expected counts back")
+    args = parser.parse_args(argv)
+
+    mismatches = find_room_mismatches()
+    for m in mismatches:
+        note = " (overbooked)" if m["overbooked"] else ""
+        print(f"Hotel '{m['hotel_id']}': available_rooms is "
+              f"{m['recorded']}, expected {m['expected']}{note}.")
+    if not mismatches:
+        print("All room counts are consistent.")
+        return 0
+    if args.repair:
+        repaired = repair_room_counts(mismatches)
+        print(f"{repaired} hotel(s) repaired.")
+        if repaired < len(mismatches):
+            print(f"{len(mismatches) - repaired} hotel(s) changed meanwhile"
+                  "; run the check again.")
+            return 1
+        return 0
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,6 +3,8 @@
 
 import uuid
 from dataclasses import dataclass
+from src import waitlist
+from src.archive import ReservationArchive
 from src.file_db import FileDB
 from src.hotel import HotelRepository
 from src.customer import CustomerRepository
@@ -47,6 +49,8 @@ class Reservation:
 class ReservationRepository:
     """Repository for Reservation persistence and operations."""
 
+    ARCHIVABLE_STATUSES = ("cancelled",)
+
     @staticmethod
     def get_all():
         """Return all reservations loaded from persistent storage."""
@@ -54,9 +58,12 @@ class ReservationRepository:
         return [Reservation.from_dict(data) for data in data_values]
 
     @staticmethod
-    def create(customer_id, hotel_id):
+    def create(customer_id, hotel_id, allow_waitlist=False, priority=0):
         """Create a new reservation if customer and hotel exist.
 
+        When the hotel is sold out, or others already wait for it, and
+        `allow_waitlist` is set, the booking is stored with status
+        "waitlisted" and queued by `priority` (lower first), then arrival.
         Returns the Reservation on success, or None.
         """
         customer_id = str(customer_id)
@@ -72,20 +79,52 @@ class ReservationRepository:
             print(f"Error: Hotel '{hotel_id}' not found.")
             return None
 
-        if not HotelRepository.reserve(hotel_id):
-            return None
+        queued = ReservationRepository.waitlist_ahead(hotel_id)
+        status = "active"
+        if queued or not HotelRepository.reserve(hotel_id):
+            if not allow_waitlist:
+                if queued:
+                    print(f"Error: Rooms at '{hotel_id}' are held for "
+                          "its waitlist.")
+                return None
+            status = "waitlisted"
 
         reservation_id = str(uuid.uuid4())
-        reservation = Reservation(reservation_id, customer_id, hotel_id)
+        reservation = Reservation(reservation_id, customer_id, hotel_id,
+                                  status)
         reservations = FileDB.load_reservations_data()
         reservations[reservation_id] = reservation.to_dict()
         FileDB.save_reservations_data(reservations)
-        print(f"Reservation '{reservation_id}' created.")
+
+        if status == "waitlisted":
+            waitlists = FileDB.load_waitlist_data()
+            waitlist.push(waitlists, hotel_id, reservation_id, priority)
+            FileDB.save_waitlist_data(waitlists)
+            print(f"Reservation '{reservation_id}' waitlisted.")
+        else:
+            print(f"Reservation '{reservation_id}' created.")
         return reservation
 
+    @staticmethod
+    def waitlist_ahead(hotel_id):
+        """Return True if earlier bookings still wait for `hotel_id`.
+
+        Free rooms are first handed to the waitlist, so this is only True
+        while the hotel is sold out to the people already queued.
+        """
+        if not waitlist.size(FileDB.load_waitlist_data(), hotel_id):
+            return False
+        HotelRepository.fill_vacancies(hotel_id)
+        return waitlist.size(FileDB.load_waitlist_data(), hotel_id) > 0
+
     @staticmethod
     def cancel(reservation_id):
-        """Cancel a reservation and restore a room on success."""
+        """Cancel a reservation and hand its room on or restore it.
+
+        Cancelling an active reservation promotes the head of the hotel's
+        waitlist in the same reservations write; only when nobody waits is
+        the room given back to the hotel.
+        """
         reservations = FileDB.load_reservations_data()
         reservation_id = str(reservation_id)
 
@@ -103,21 +142,70 @@ class ReservationRepository:
             print(msg)
             return False
 
+        previous_status = reservation.status
         reservation.status = "cancelled"
         reservations[reservation_id] = reservation.to_dict()
+
+        waitlists = FileDB.load_waitlist_data()
+        had_waitlist = reservation.hotel_id in waitlists
+        promoted = None
+        if previous_status == "waitlisted":
+            waitlist.remove(waitlists, reservation.hotel_id, reservation_id)
+        else:
+            promoted = waitlist.promote(reservations, waitlists,
+                                        reservation.hotel_id)
+
         FileDB.save_reservations_data(reservations)
-        HotelRepository.cancel(reservation.hotel_id)
+        if had_waitlist:
+            FileDB.save_waitlist_data(waitlists)
+        if previous_status == "active" and promoted is None:
+            HotelRepository.cancel(reservation.hotel_id)
         print(f"Reservation '{reservation_id}' cancelled.")
         return True
 
     @staticmethod
     def get(reservation_id):
-        """Return the Reservation with `reservation_id`, or None if missing."""
+        """Return the Reservation with `reservation_id`, or None if missing.
+
+        Falls back to the archive when the id is not in the hot file.
+        """
         reservations = FileDB.load_reservations_data()
         reservation_id = str(reservation_id)
 
-        if reservation_id not in reservations:
+        if reservation_id in reservations:
+            return Reservation.from_dict(reservations[reservation_id])
+
+        archived = ReservationArchive.find(reservation_id)
+        if archived is None:
             print(f"Error: Reservation '{reservation_id}' not found.")
             return None
+        return Reservation.from_dict(archived)
 
-        return Reservation.from_dict(reservations[reservation_id])
+    @staticmethod
+    def archive(day=None):
+        """Move cancelled reservations out of the hot file into the archive.
+
+        Records are appended to the archive before the hot file is rewritten,
+        so a crash in between leaves a harmless duplicate instead of a loss.
+        Returns the number of reservations archived.
+        """
+        if ReservationArchive.directory() is None:
+            print("Error: The active storage backend has no archive.")
+            return 0
+
+        reservations = FileDB.load_reservations_data()
+        cold = [
+            data
+            for data in reservations.values()
+            if data.get("status", "active")
+            in ReservationRepository.ARCHIVABLE_STATUSES
+        ]
+        if not cold:
+            return 0
+
+        ReservationArchive.append(cold, day)
+        for data in cold:
+            del reservations[data["reservation_id"]]
+        FileDB.save_reservations_data(reservations)
+        print(f"{len(cold)} reservation(s) archived.")
+        return len(cold)
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""Storage backends behind FileDB: JSON files on disk or plain memory."""
+
+import copy
+import json
+import os
+import threading
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+
+def file_identity(filepath) -> Optional[int]:
+    """Return the inode currently published at `filepath`, or None."""
+    try:
+        return os.stat(filepath).st_ino
+    except FileNotFoundError:
+        return None
+
+
+def stat_signature(stat: os.stat_result) -> Tuple[int, int, int]:
+    """Return the (inode, size, mtime_ns) identifying one file version."""
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+class IOStats(dict):
+    """I/O counters of one backend, safe to update from many threads."""
+
+    def __init__(self):
+        """Start every counter at zero."""
+        super().__init__(reads=0, writes=0, bytes_read=0, bytes_written=0)
+        self._lock = threading.Lock()
+
+    def count(self, **deltas: int):
+        """Add `deltas` to the named counters as one atomic update."""
+        with self._lock:
+            for key, delta in deltas.items():
+                self[key] += delta
+
+
+class PinnedBackend:
+    """Read-only view of every table as of the moment it was pinned.
+
+    Writers never modify a published version, so the pinned mappings stay
+    valid however many saves happen afterwards. Loads return copies.
+    """
+
+    def __init__(self, root: Optional[str], stats: IOStats,
+                 versions: Dict[str, Dict]):
+        """Wrap the pinned `versions` of a backend rooted at `root`."""
+        self.root = root
+        self.stats = stats
+        self.versions = versions
+
+    def load(self, name: str) -> Dict:
+        """Return a copy of the pinned mapping of table `name`."""
+        return copy.deepcopy(self.versions.get(name, {}))
+
+    def ensure_root(self):
+        """Refuse to prepare a write; snapshots are read-only."""
+        raise RuntimeError("Cannot write inside a read snapshot.")
+
+    def save(self, name: str, data: Dict):
+        """Refuse to write; snapshots are read-only."""
+        raise RuntimeError(f"Cannot save '{name}' inside a read snapshot.")
+
+    def pin(self, names: Iterable[str],
+            retries: int = 10) -> "PinnedBackend":
+        """Return this view; nested snapshots share the outer version."""
+        del names, retries
+        return self
+
+
+class JsonFileBackend:
+    """Stores each table as `<root>/<table>.json`."""
+
+    def __init__(self, root: str = "data"):
+        """Use `root` as the data directory; it is created on first save."""
+        self.root = root
+        self.stats = IOStats()
+        self._root_ready = False
+        self._last_read: Optional[Tuple[str, Tuple[int, int, int],
+                                        bytes]] = None
+
+    def ensure_root(self):
+        """Create the data directory the first time it is needed."""
+        if not self._root_ready:
+            os.makedirs(self.root, exist_ok=True)
+            self._root_ready = True
+
+    def path(self, name: str) -> str:
+        """Return the JSON file path of table `name`."""
+        return os.path.join(self.root, f"{name}.json")
+
+    def load(self, name: str) -> Dict:
+        """Load the mapping of table `name`, or {} if it does not exist."""
+        try:
+            with open(self.path(name), "rb") as f:
+                return self._parse(name, f)
+        except FileNotFoundError:
+            return {}
+
+    def load_published(self, name: str) -> Dict:
+        """Load the version of `name` published right now.
+
+        When it is the version this backend read last, before any save,
+        the bytes kept from that read are decoded instead of reading the
+        file again. Only that one read is kept, so at most one table's
+        bytes stay in memory, and only until the next save.
+        """
+        try:
+            signature = stat_signature(os.stat(self.path(name)))
+        except FileNotFoundError:
+            return {}
+        last_read = self._last_read
+        if last_read is not None and last_read[:2] == (name, signature):
+            return json.loads(last_read[2])
+        return self.load(name)
+
+    def _parse(self, name: str, f) -> Dict:
+        """Read and decode one open table file, counting the I/O."""
+        raw = f.read()
+        self.stats.count(reads=1, bytes_read=len(raw))
+        self._last_read = (name, stat_signature(os.fstat(f.fileno())), raw)
+        return json.loads(raw)
+
+    def save(self, name: str, data: Dict):
+        """Publish `data` as a new version of table `name`.
+
+        The JSON is written to a private temporary file which then replaces
+        the table file atomically, so readers see either the old or the new
+        version in full and never wait for the writer.
+        """
+        self.ensure_root()
+        path = self.path(name)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        raw = json.dumps(data, indent=4).encode("utf-8")
+        with open(tmp_path, "wb") as f:
+            f.write(raw)
+        os.replace(tmp_path, path)
+        self._last_read = None
+        self.stats.count(writes=1, bytes_written=len(raw))
+
+    def pin(self, names: Iterable[str],
+            retries: int = 10) -> PinnedBackend:
+        """Pin the versions of `names` that are current right now.
+
+        Every table file is opened first; the set is accepted only if all
+        opened files are still the published ones, otherwise a writer
+        swapped one in between and pinning is retried. Raises RuntimeError
+        if no stable set is found.
+        """
+        paths = {name: self.path(name) for name in names}
+        for _ in range(retries):
+            with ExitStack() as stack:
+                handles = {}
+                for name, path in paths.items():
+                    try:
+                        handles[name] = stack.enter_context(open(path, "rb"))
+                    except FileNotFoundError:
+                        handles[name] = None
+                if all(self._is_current(paths[name], f)
+                       for name, f in handles.items()):
+                    versions = {
+                        name: self._parse(name, f) if f else {}
+                        for name, f in handles.items()
+                    }
+                    return PinnedBackend(self.root, self.stats, versions)
+        raise RuntimeError("Could not take a consistent snapshot.")
+
+    @staticmethod
+    def _is_current(path: str, f) -> bool:
+        """Return True if the open file `f` is still published at `path`."""
+        current = file_identity(path)
+        if f is None:
+            return current is None
+        return current == os.fstat(f.fileno()).st_ino
+
+
+class MemoryBackend:
+    """Keeps every table in a dict; nothing touches the filesystem.
+
+    Loads and saves copy the mappings, so callers mutating what they
+    loaded behave exactly as with files. There is no data directory, so
+    the change feed and the reservation archive are unavailable.
+    """
+
+    root = None
+
+    def __init__(self, tables: Optional[Dict[str, Dict]] = None):
+        """Start from a copy of `tables`, or empty."""
+        self.tables = copy.deepcopy(tables or {})
+        self.stats = IOStats()
+
+    def load(self, name: str) -> Dict:
+        """Return a copy of the mapping of table `name`."""
+        self.stats.count(reads=1)
+        return copy.deepcopy(self.tables.get(name, {}))
+
+    def save(self, name: str, data: Dict):
+        """Publish a copy of `data` as the new mapping of table `name`.
+
+        Published mappings are replaced, never mutated, so pinned versions
+        stay valid.
+        """
+        self.stats.count(writes=1)
+        self.tables[name] = copy.deepcopy(data)
+
+    def pin(self, names: Iterable[str],
+            retries: int = 10) -> PinnedBackend:
+        """Pin the current mappings of `names`; this never races."""
+        del retries
+        versions = {name: self.tables.get(name, {}) for name in names}
+        return PinnedBackend(None, self.stats, versions)
+
+
+_default_backend = [JsonFileBackend()]
+_context_backend: ContextVar = ContextVar("storage_backend", default=None)
+
+
+def get_backend():
+    """Return the backend of the current context, or the default one."""
+    return _context_backend.get() or _default_backend[0]
+
+
+def set_backend(backend):
+    """Make `backend` the process-wide default."""
+    _default_backend[0] = backend
+
+
+@contextmanager
+def use_backend(backend) -> Iterator:
+    """Use `backend` for the current context inside the `with` block."""
+    token = _context_backend.set(backend)
+    try:
+        yield backend
+    finally:
+        _context_backend.reset(token)
+
+
+def data_dir() -> Optional[str]:
+    """Return the data directory of the active backend, or None."""
+    return get_backend().root
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Process-local table cache kept warm by tailing the change feed."""
+
+from typing import Dict, Optional
+from src.change_feed import ChangeFeed
+from src.file_db import FileDB
+
+
+class TableCache:
+    """In-memory copy of every table that applies deltas from the feed.
+
+    Backends without a data directory have no feed, so there the cache
+    only changes on `reload`.
+    """
+
+    def __init__(self):
+        """Load the initial snapshot of every table."""
+        self.offset = 0
+        self.sequence = 0
+        self.tables: Dict[str, Dict] = {}
+        self.reload()
+
+    def reload(self):
+        """Reload every table and remember where in the feed it was taken.
+
+        The feed position is read first, so any change racing the snapshot
+        is replayed by the next refresh; replays are harmless because every
+        change carries the full record.
+        """
+        self.offset = ChangeFeed.size()
+        self.sequence = ChangeFeed.last_sequence()
+        self.tables = FileDB.load_snapshot()
+
+    def refresh(self) -> int:
+        """Apply changes written since the last refresh; return how many."""
+        if ChangeFeed.size() < self.offset:
+            self.reload()
+            return 0
+        changes, self.offset = ChangeFeed.read(self.offset)
+        for change in changes:
+            if change["op"] == "reset":
+                self.tables[change["table"]] = FileDB.load_table(
+                    change["table"]
+                )
+            else:
+                ChangeFeed.apply(self.tables, change)
+            self.sequence = max(self.sequence, change["seq"])
+        return len(changes)
+
+    def get(self, table: str, key: str) -> Optional[Dict]:
+        """Return the cached record `key` of `table`, or None."""
+        return self.tables.get(table, {}).get(str(key))
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Streaming NDJSON export and import of all FileDB tables.
+
+Usage:
+    python -m src.transfer export <directory>
+    python -m src.transfer import <directory> [--merge] [--batch-size N]
+"""
+
+import argparse
+import json
+import os
+from typing import Dict, Iterator, List, Optional
+from src.file_db import FileDB
+
+
+KEY_FIELDS = {
+    "customers": "customer_id",
+    "hotels": "hotel_id",
+    "reservations": "reservation_id",
+    "waitlist": "hotel_id",
+}
+
+
+def table_path(directory: str, name: str) -> str:
+    """Return the NDJSON file path for table `name` inside `directory`."""
+    return os.path.join(directory, f"{name}.ndjson")
+
+
+def export_ndjson(directory: str) -> Dict[str, int]:
+    """Export every table from one consistent snapshot into `directory`.
+
+    Records are written one per line; returns the count per table.
+    """
+    os.makedirs(directory, exist_ok=True)
+    snapshot = FileDB.load_snapshot()
+    counts = {}
+    for name, records in snapshot.items():
+        count = 0
+        with open(table_path(directory, name), "w", encoding="utf-8") as f:
+            for record in records.values():
+                f.write(json.dumps(record) + "\n")
+                count += 1
+        counts[name] = count
+    return counts
+
+
+def iter_batches(path: str, batch_size: int) -> Iterator[List[Dict]]:
+    """Yield lists of at most `batch_size` records read from `path`."""
+    batch = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            batch.append(json.loads(line))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def import_ndjson(directory: str, merge: bool = False,
+                  batch_size: int = 10000) -> Dict[str, int]:
+    """Import every table file found in `directory`.
+
+    Batches are folded into the in-memory mapping and each table is written
+    once, instead of rewriting the JSON file per record; the change feed
+    gets a single "reset" change per table. Without `merge` the imported
+    records replace the table. Returns the count per table.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1.")
+    counts = {}
+    for name, key in KEY_FIELDS.items():
+        path = table_path(directory, name)
+        if not os.path.exists(path):
+            continue
+        records = FileDB.load_table(name) if merge else {}
+        count = 0
+        for batch in iter_batches(path, batch_size):
+            records.update((str(r[key]), r) for r in batch)
+            count += len(batch)
+        FileDB.save_table(name, records, bulk=True)
+        counts[name] = count
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the export/import command line; return the exit status."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_cmd = commands.add_parser("export", help="write NDJSON files")
+    export_cmd.add_argument("directory")
+    import_cmd = commands.add_parser("import", help="read NDJSON files")
+    import_cmd.add_argument("directory")
+    import_cmd.add_argument("--merge", action="store_true",
+                            help="keep records missing from the input")
+    import_cmd.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        counts = export_ndjson(args.directory)
+    else:
+        counts = import_ndjson(args.directory, args.merge, args.batch_size)
+    for name, count in counts.items():
+        print(f"{args.command}: {count} {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Per-hotel waitlists kept as binary heaps inside the waitlist table.
+
+The table maps each hotel id to `{"hotel_id": ..., "entries": [...]}`
+where `entries` is a heap of `[priority, arrival, reservation_id]`. Lower
+priority values are served first; ties go to the earliest arrival.
+"""
+
+import heapq
+import time
+from typing import Dict, Optional
+
+
+def push(waitlists: Dict, hotel_id: str, reservation_id: str,
+         priority: int = 0, arrival: Optional[int] = None):
+    """Add `reservation_id` to the waitlist of `hotel_id` in O(log n)."""
+    if arrival is None:
+        arrival = time.time_ns()
+    waitlist = waitlists.setdefault(
+        hotel_id, {"hotel_id": hotel_id, "entries": []}
+    )
+    heapq.heappush(waitlist["entries"],
+                   [int(priority), int(arrival), str(reservation_id)])
+
+
+def pop(waitlists: Dict, hotel_id: str) -> Optional[str]:
+    """Remove and return the head of the waitlist in O(log n), or None."""
+    waitlist = waitlists.get(hotel_id)
+    if not waitlist or not waitlist["entries"]:
+        return None
+    _, _, reservation_id = heapq.heappop(waitlist["entries"])
+    if not waitlist["entries"]:
+        del waitlists[hotel_id]
+    return reservation_id
+
+
+def remove(waitlists: Dict, hotel_id: str, reservation_id: str) -> bool:
+    """Remove `reservation_id` from anywhere in the waitlist; O(n)."""
+    waitlist = waitlists.get(hotel_id)
+    if not waitlist:
+        return False
+    entries = [e for e in waitlist["entries"] if e[2] != reservation_id]
+    if len(entries) == len(waitlist["entries"]):
+        return False
+    if entries:
+        heapq.heapify(entries)
+        waitlist["entries"] = entries
+    else:
+        del waitlists[hotel_id]
+    return True
+
+
+def promote(reservations: Dict, waitlists: Dict,
+            hotel_id: str) -> Optional[str]:
+    """Activate the head of the hotel's waitlist inside `reservations`.
+
+    Entries whose reservation is no longer waitlisted are skipped.
+    Returns the promoted reservation id, or None if nobody waits.
+    """
+    while True:
+        reservation_id = pop(waitlists, hotel_id)
+        if reservation_id is None:
+            return None
+        data = reservations.get(reservation_id)
+        if data is not None and data.get("status") == "waitlisted":
+            data["status"] = "active"
+            print(f"Reservation '{reservation_id}' promoted.")
+            return reservation_id
+
+
+def fill(reservations: Dict, waitlists: Dict, hotel: Dict,
+         hotel_id: str) -> int:
+    """Promote waiting reservations into the free rooms of `hotel`.
+
+    Each promotion takes one of `hotel`'s available rooms. Returns how
+    many reservations were promoted.
+    """
+    promoted = 0
+    while hotel["available_rooms"] > 0 and \
+            promote(reservations, waitlists, hotel_id) is not None:
+        hotel["available_rooms"] -= 1
+        promoted += 1
+    return promoted
+
+
+def size(waitlists: Dict, hotel_id: str) -> int:
+    """Return how many reservations wait for `hotel_id`."""
+    waitlist = waitlists.get(hotel_id)
+    return len(waitlist["entries"]) if waitlist else 0
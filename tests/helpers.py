@@ -1,11 +1,21 @@
 #!/usr/bin/env python3
 """Shared test helper used by all test modules."""
 
+import atexit
+import shutil
+import tempfile
 from src.file_db import FileDB
 
+# One private data directory per test process, so runs never touch the
+# repository's data/ folder and can execute in parallel (pytest-xdist).
+DATA_DIR = tempfile.mkdtemp(prefix="hotel-tests-")
+atexit.register(shutil.rmtree, DATA_DIR, ignore_errors=True)
+
 
 def clear_data():
     """Reset all JSON data files to empty before each test."""
+    shutil.rmtree(DATA_DIR, ignore_errors=True)
+    FileDB.use_data_dir(DATA_DIR)
     FileDB.save_hotels_data({})
     FileDB.save_customers_data({})
     FileDB.save_reservations_data({})
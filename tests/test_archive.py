@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Unit tests for archive.py – ReservationArchive class."""
+
+import os
+import unittest
+from datetime import date
+from unittest import mock
+from tests.helpers import clear_data
+from src.archive import ReservationArchive
+from src.customer import CustomerRepository
+from src.file_db import FileDB
+from src.hotel import HotelRepository
+from src.reservation import ReservationRepository
+
+
+class TestReservationArchive(unittest.TestCase):
+    """Tests for archiving cancelled reservations."""
+
+    def setUp(self):
+        """Clear data and create one hotel and one customer for each test."""
+        clear_data()
+        HotelRepository.create("H1", "Grand", "NYC", 3)
+        CustomerRepository.create("C1", "Alice", "a@test.com", "555")
+
+    def test_segment_path_is_date_partitioned(self):
+        """segment_path names the file after the partition day."""
+        path = ReservationArchive.segment_path(date(2024, 1, 2), "xz")
+        self.assertTrue(
+            path.endswith("reservations-2024-01-02.ndjson.xz")
+        )
+
+    def test_segment_path_unknown_compression(self):
+        """segment_path rejects unsupported compression formats."""
+        with self.assertRaises(ValueError):
+            ReservationArchive.segment_path(compression="zip")
+
+    def test_append_is_append_only(self):
+        """Repeated appends to one segment keep every record."""
+        day = date(2024, 1, 2)
+        for compression in ("gz", "xz"):
+            ReservationArchive.append([{"reservation_id": "A"}], day,
+                                      compression)
+            ReservationArchive.append([{"reservation_id": "B"}], day,
+                                      compression)
+            path = ReservationArchive.segment_path(day, compression)
+            ids = [r["reservation_id"]
+                   for r in ReservationArchive.iter_segment(path)]
+            self.assertEqual(ids, ["A", "B"])
+
+    def test_append_empty(self):
+        """append with no records writes nothing."""
+        self.assertEqual(ReservationArchive.append([]), 0)
+        self.assertEqual(ReservationArchive.segments(), [])
+
+    def test_segments_newest_first(self):
+        """segments lists partitions newest first."""
+        ReservationArchive.append([{"reservation_id": "A"}],
+                                  date(2024, 1, 1))
+        ReservationArchive.append([{"reservation_id": "B"}],
+                                  date(2024, 1, 2))
+        names = [os.path.basename(p) for p in ReservationArchive.segments()]
+        self.assertEqual(names[0], "reservations-2024-01-02.ndjson.gz")
+
+    def test_archive_moves_only_cancelled(self):
+        """archive removes cancelled reservations from the hot file."""
+        kept = ReservationRepository.create("C1", "H1")
+        gone = ReservationRepository.create("C1", "H1")
+        ReservationRepository.cancel(gone.reservation_id)
+        self.assertEqual(ReservationRepository.archive(), 1)
+        hot = FileDB.load_reservations_data()
+        self.assertIn(kept.reservation_id, hot)
+        self.assertNotIn(gone.reservation_id, hot)
+
+    def test_archive_nothing_to_do(self):
+        """archive returns 0 when no reservation is cancelled."""
+        ReservationRepository.create("C1", "H1")
+        self.assertEqual(ReservationRepository.archive(), 0)
+
+    def test_get_falls_back_to_archive(self):
+        """get finds a reservation after it was archived."""
+        r = ReservationRepository.create("C1", "H1")
+        ReservationRepository.cancel(r.reservation_id)
+        ReservationRepository.archive()
+        found = ReservationRepository.get(r.reservation_id)
+        self.assertIsNotNone(found)
+        self.assertEqual(found.status, "cancelled")
+
+    def test_find_reads_only_the_matching_segment(self):
+        """find skips segments whose id list lacks the reservation."""
+        ReservationArchive.append([{"reservation_id": "A"}], date(2024, 1, 1))
+        ReservationArchive.append([{"reservation_id": "B"}], date(2024, 1, 2))
+        with mock.patch.object(ReservationArchive, "iter_segment",
+                               wraps=ReservationArchive.iter_segment) as read:
+            self.assertEqual(ReservationArchive.find("A"),
+                             {"reservation_id": "A"})
+            self.assertIsNone(ReservationArchive.find("missing"))
+        self.assertEqual(read.call_count, 1)
+
+    def test_find_scans_segments_without_id_list(self):
+        """Segments written before id lists existed are still searched."""
+        ReservationArchive.append([{"reservation_id": "A"}], date(2024, 1, 1))
+        path = ReservationArchive.segment_path(date(2024, 1, 1))
+        os.remove(ReservationArchive.ids_path(path))
+        self.assertEqual(ReservationArchive.find("A"),
+                         {"reservation_id": "A"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Unit tests for cascading customer and hotel deletes."""
+
+import unittest
+from unittest import mock
+from tests.helpers import clear_data
+from src.customer import CustomerRepository
+from src.file_db import FileDB
+from src.hotel import HotelRepository
+from src.reservation import ReservationRepository
+
+
+class TestCascadingDeletes(unittest.TestCase):
+    """Tests for CustomerRepository and HotelRepository deletes."""
+
+    def setUp(self):
+        """Clear data and create two hotels and two customers."""
+        clear_data()
+        HotelRepository.create("H1", "Grand", "NYC", 2)
+        HotelRepository.create("H2", "Tiny", "LA", 1)
+        CustomerRepository.create("C1", "Alice", "a@test.com", "555")
+        CustomerRepository.create("C2", "Bob", "b@test.com", "556")
+
+    def test_customer_delete_cancels_and_restores_rooms(self):
+        """Deleting a customer cancels its bookings and frees rooms."""
+        r = ReservationRepository.create("C1", "H1")
+        other = ReservationRepository.create("C2", "H1")
+        self.assertTrue(CustomerRepository.delete("C1"))
+        self.assertEqual(ReservationRepository.get(r.reservation_id).status,
+                         "cancelled")
+        self.assertEqual(
+            ReservationRepository.get(other.reservation_id).status, "active"
+        )
+        self.assertEqual(HotelRepository.get("H1").available_rooms, 1)
+
+    def test_customer_delete_promotes_waitlist(self):
+        """A freed room goes to the hotel's waitlist first."""
+        ReservationRepository.create("C1", "H2")
+        waiting = ReservationRepository.create("C2", "H2",
+                                               allow_waitlist=True)
+        CustomerRepository.delete("C1")
+        self.assertEqual(
+            ReservationRepository.get(waiting.reservation_id).status,
+            "active",
+        )
+        self.assertEqual(HotelRepository.get("H2").available_rooms, 0)
+
+    def test_delete_many_never_promotes_its_own_batch(self):
+        """Waitlisted bookings of the batch leave before rooms are freed."""
+        ReservationRepository.create("C1", "H2")
+        ReservationRepository.create("C2", "H2", allow_waitlist=True)
+        with mock.patch("builtins.print") as printed:
+            CustomerRepository.delete_many(["C1", "C2"])
+        messages = [call.args[0] for call in printed.call_args_list]
+        self.assertFalse(any("promoted" in m for m in messages))
+        self.assertEqual(FileDB.load_waitlist_data(), {})
+        self.assertEqual(HotelRepository.get("H2").available_rooms, 1)
+
+    def test_customer_delete_archives(self):
+        """With archive=True dependents move to the archive."""
+        r = ReservationRepository.create("C1", "H1")
+        CustomerRepository.delete("C1", archive=True)
+        self.assertNotIn(r.reservation_id, FileDB.load_reservations_data())
+        self.assertEqual(ReservationRepository.get(r.reservation_id).status,
+                         "cancelled")
+        self.assertEqual(HotelRepository.get("H1").available_rooms, 2)
+
+    def test_hotel_delete_cancels_and_drops_waitlist(self):
+        """Deleting a hotel cancels its bookings and its waitlist."""
+        r = ReservationRepository.create("C1", "H2")
+        waiting = ReservationRepository.create("C2", "H2",
+                                               allow_waitlist=True)
+        self.assertTrue(HotelRepository.delete("H2"))
+        for reservation in (r, waiting):
+            self.assertEqual(
+                ReservationRepository.get(reservation.reservation_id).status,
+                "cancelled",
+            )
+        self.assertEqual(FileDB.load_waitlist_data(), {})
+
+    def test_delete_many_writes_each_file_once(self):
+        """A batch delete saves every affected table a single time."""
+        for customer_id in ("C1", "C2"):
+            ReservationRepository.create(customer_id, "H1")
+        with mock.patch.object(FileDB, "save_table",
+                               wraps=FileDB.save_table) as save:
+            deleted = CustomerRepository.delete_many(["C1", "C2", "NOPE"])
+        self.assertEqual(deleted, 2)
+        saved = [call.args[0] for call in save.call_args_list]
+        self.assertEqual(sorted(saved),
+                         ["customers", "hotels", "reservations"])
+        self.assertEqual(HotelRepository.get("H1").available_rooms, 2)
+
+    def test_delete_many_reads_reservations_once(self):
+        """A batch delete scans the reservations table a single time."""
+        for customer_id in ("C1", "C2"):
+            ReservationRepository.create(customer_id, "H1")
+        with mock.patch.object(FileDB, "load_table",
+                               wraps=FileDB.load_table) as load:
+            CustomerRepository.delete_many(["C1", "C2"])
+        loaded = [call.args[0] for call in load.call_args_list]
+        self.assertEqual(loaded.count("reservations"), 1)
+
+    def test_create_writes_only_reservations(self):
+        """Booking rewrites the hotels and reservations tables only."""
+        with mock.patch.object(FileDB, "save_table",
+                               wraps=FileDB.save_table) as save:
+            ReservationRepository.create("C1", "H1")
+        saved = [call.args[0] for call in save.call_args_list]
+        self.assertEqual(saved, ["hotels", "reservations"])
+
+    def test_hotel_delete_many(self):
+        """Several hotels can be deleted in one call."""
+        self.assertEqual(HotelRepository.delete_many(["H1", "H2", "H1"]), 2)
+        self.assertEqual(HotelRepository.get_all(), [])
+
+    def test_delete_many_nothing_found(self):
+        """Batch deletes of unknown ids change nothing."""
+        self.assertEqual(CustomerRepository.delete_many(["NOPE"]), 0)
+        self.assertEqual(HotelRepository.delete_many(["NOPE"]), 0)
+
+    def test_delete_without_dependents(self):
+        """Deleting a record without reservations still works."""
+        self.assertTrue(CustomerRepository.delete("C2"))
+        self.assertTrue(HotelRepository.delete("H2"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Unit tests for change_feed.py and table_cache.py."""
+
+import multiprocessing
+import tempfile
+import unittest
+from tests.helpers import DATA_DIR, clear_data
+from src import storage, transfer
+from src.change_feed import ChangeFeed, diff_tables
+from src.customer import CustomerRepository
+from src.file_db import FileDB
+from src.hotel import HotelRepository
+from src.table_cache import TableCache
+
+
+def create_customers(prefix, count):
+    """Create `count` customers from a separate process."""
+    FileDB.use_data_dir(DATA_DIR)
+    for i in range(count):
+        CustomerRepository.create(f"{prefix}{i}", "Name", "e@test.com", "1")
+
+
+class TestChangeFeed(unittest.TestCase):
+    """Tests for the FileDB change feed and its subscribers."""
+
+    def setUp(self):
+        """Clear data and the change feed before each test."""
+        clear_data()
+
+    def test_diff_tables(self):
+        """diff_tables reports upserts and deletes only."""
+        old = {"A": {"v": 1}, "B": {"v": 1}, "C": {"v": 1}}
+        new = {"A": {"v": 1}, "B": {"v": 2}, "D": {"v": 1}}
+        self.assertEqual(
+            sorted(diff_tables(old, new)),
+            [("delete", "C", None), ("upsert", "B", {"v": 2}),
+             ("upsert", "D", {"v": 1})],
+        )
+
+    def test_save_emits_changes_with_monotonic_seq(self):
+        """Each saved record change gets the next sequence number."""
+        HotelRepository.create("H1", "Grand", "NYC", 3)
+        HotelRepository.reserve("H1")
+        HotelRepository.delete("H1")
+        changes, _ = ChangeFeed.read()
+        self.assertEqual([c["seq"] for c in changes], [1, 2, 3])
+        self.assertEqual([c["op"] for c in changes],
+                         ["upsert", "upsert", "delete"])
+        self.assertEqual(changes[1]["record"]["available_rooms"], 2)
+        self.assertEqual(ChangeFeed.last_sequence(), 3)
+
+    def test_unchanged_save_emits_nothing(self):
+        """Saving identical data does not grow the feed."""
+        HotelRepository.create("H1", "Grand", "NYC", 3)
+        HotelRepository.modify("H1")
+        self.assertEqual(ChangeFeed.last_sequence(), 1)
+
+    def test_read_from_offset(self):
+        """read only returns changes after the given offset."""
+        HotelRepository.create("H1", "Grand", "NYC", 3)
+        _, offset = ChangeFeed.read()
+        HotelRepository.reserve("H1")
+        changes, _ = ChangeFeed.read(offset)
+        self.assertEqual(len(changes), 1)
+
+    def test_follow_since_and_timeout(self):
+        """follow yields changes after `since` and stops when idle."""
+        HotelRepository.create("H1", "Grand", "NYC", 3)
+        HotelRepository.reserve("H1")
+        seen = list(ChangeFeed.follow(since=1, poll_interval=0.01,
+                                      timeout=0.05))
+        self.assertEqual([c["seq"] for c in seen], [2])
+
+    def test_table_cache_applies_deltas(self):
+        """TableCache picks up other writers' changes on refresh."""
+        HotelRepository.create("H1", "Grand", "NYC", 3)
+        cache = TableCache()
+        HotelRepository.reserve("H1")
+        HotelRepository.create("H2", "Tiny", "LA", 1)
+        self.assertEqual(cache.refresh(), 2)
+        self.assertEqual(cache.get("hotels", "H1")["available_rooms"], 2)
+        HotelRepository.delete("H2")
+        cache.refresh()
+        self.assertIsNone(cache.get("hotels", "H2"))
+        self.assertEqual(cache.sequence, ChangeFeed.last_sequence())
+
+    def test_table_cache_reloads_after_truncation(self):
+        """TableCache reloads when the feed was reset underneath it."""
+        HotelRepository.create("H1", "Grand", "NYC", 3)
+        cache = TableCache()
+        clear_data()
+        self.assertEqual(cache.refresh(), 0)
+        self.assertIsNone(cache.get("hotels", "H1"))
+
+    def test_memory_backend_has_empty_feed(self):
+        """Without a data directory the feed is empty and unwritable."""
+        with FileDB.using(storage.MemoryBackend()):
+            HotelRepository.create("H1", "Grand", "NYC", 3)
+            self.assertIsNone(ChangeFeed.changes_path())
+            self.assertEqual(ChangeFeed.size(), 0)
+            self.assertEqual(ChangeFeed.read(), ([], 0))
+            self.assertEqual(ChangeFeed.last_sequence(), 0)
+            cache = TableCache()
+            self.assertEqual(cache.get("hotels", "H1")["name"], "Grand")
+            self.assertEqual(cache.refresh(), 0)
+            with self.assertRaises(RuntimeError):
+                with ChangeFeed.lock():
+                    pass
+
+    def test_sequence_is_unique_across_processes(self):
+        """Concurrent writers in several processes never share a seq."""
+        workers = [
+            multiprocessing.Process(target=create_customers,
+                                    args=(f"P{n}-", 20))
+            for n in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        changes, _ = ChangeFeed.read()
+        self.assertEqual([c["seq"] for c in changes],
+                         list(range(1, len(changes) + 1)))
+        self.assertEqual(ChangeFeed.last_sequence(), len(changes))
+        replayed = {}
+        for change in changes:
+            ChangeFeed.apply(replayed, change)
+        self.assertEqual(replayed["customers"],
+                         FileDB.load_customers_data())
+
+    def test_save_diffs_against_replaced_version(self):
+        """A save racing another writer still emits the right deltas."""
+        HotelRepository.create("H1", "Grand", "NYC", 3)
+        hotels = FileDB.load_hotels_data()
+        other = storage.JsonFileBackend(DATA_DIR)
+        published = other.load("hotels")
+        published["H2"] = dict(published["H1"], hotel_id="H2")
+        other.save("hotels", published)
+        hotels["H1"]["available_rooms"] = 2
+        FileDB.save_hotels_data(hotels)
+        changes, _ = ChangeFeed.read()
+        self.assertEqual([(c["op"], c["key"]) for c in changes[1:]],
+                         [("upsert", "H1"), ("delete", "H2")])
+
+    def test_save_reuses_last_loaded_version(self):
+        """Saving after a load does not read the table file again."""
+        HotelRepository.create("H1", "Grand", "NYC", 3)
+        hotels = FileDB.load_hotels_data()
+        reads = storage.get_backend().stats["reads"]
+        hotels["H1"]["available_rooms"] = 2
+        FileDB.save_hotels_data(hotels)
+        self.assertEqual(storage.get_backend().stats["reads"], reads)
+
+    def test_backend_keeps_only_the_last_read(self):
+        """Cached table bytes are limited to one read and dropped on save."""
+        HotelRepository.create("H1", "Grand", "NYC", 3)
+        CustomerRepository.create("C1", "Alice", "a@test.com", "555")
+        backend = storage.get_backend()
+        hotels = FileDB.load_hotels_data()
+        FileDB.load_customers_data()
+        reads = backend.stats["reads"]
+        FileDB.save_hotels_data(hotels)
+        self.assertEqual(backend.stats["reads"], reads + 1)
+        hotels["H1"]["available_rooms"] = 2
+        FileDB.save_hotels_data(hotels)
+        self.assertEqual(backend.stats["reads"], reads + 2)
+
+    def test_bulk_import_emits_one_reset(self):
+        """NDJSON imports log one reset per table, which caches reload."""
+        HotelRepository.create("H1", "Grand", "NYC", 3)
+        cache = TableCache()
+        with tempfile.TemporaryDirectory() as tmp:
+            transfer.export_ndjson(tmp)
+            HotelRepository.delete("H1")
+            offset = ChangeFeed.size()
+            transfer.import_ndjson(tmp)
+        changes, _ = ChangeFeed.read(offset)
+        self.assertEqual({c["op"] for c in changes}, {"reset"})
+        cache.refresh()
+        self.assertEqual(cache.get("hotels", "H1")["available_rooms"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Unit tests for loadgen.py – workload generation and replay."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from tests.helpers import DATA_DIR, clear_data
+from src import loadgen, storage
+
+
+class TestLoadgen(unittest.TestCase):
+    """Tests for generating and replaying booking traces."""
+
+    def setUp(self):
+        """Clear data and give each test a scratch directory."""
+        clear_data()
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        self.data_dir = os.path.join(self.tmp, "data")
+
+    def test_generate_is_deterministic_per_seed(self):
+        """The same seed yields the same trace."""
+        shape = loadgen.TraceShape(50)
+        first = list(loadgen.generate_trace(shape, seed=7))
+        self.assertEqual(first, list(loadgen.generate_trace(shape, seed=7)))
+
+    def test_generate_emits_setup_first(self):
+        """Hotels and customers are created before the measured ops."""
+        shape = loadgen.TraceShape(10, hotels=2, customers=3)
+        trace = list(loadgen.generate_trace(shape))
+        self.assertEqual(len(trace), 15)
+        self.assertTrue(all(op.get("setup") for op in trace[:5]))
+        self.assertFalse(any(op.get("setup") for op in trace[5:]))
+
+    def test_percentile(self):
+        """percentile uses the nearest-rank method."""
+        values = list(range(1, 101))
+        self.assertEqual(loadgen.percentile(values, 50), 50)
+        self.assertEqual(loadgen.percentile(values, 99), 99)
+        self.assertEqual(loadgen.percentile([], 99), 0.0)
+
+    def test_run_operation_without_reservation(self):
+        """Cancelling with nothing created counts as rejected."""
+        self.assertFalse(
+            loadgen.run_operation({"op": "reservation.cancel"}, [])
+        )
+
+    def test_replay_single_worker_report(self):
+        """A serial replay books rooms without errors or overbooking."""
+        shape = loadgen.TraceShape(200, hotels=2, rooms=5)
+        trace = loadgen.generate_trace(shape, seed=1)
+        report = loadgen.replay(trace, self.data_dir)
+        self.assertEqual(report["operations"], 200)
+        self.assertEqual(report["errors"], 0)
+        self.assertEqual(report["overbooked"], 0)
+        self.assertEqual(report["room_count_drift"], 0)
+        self.assertGreater(report["io"]["bytes_written"], 0)
+        self.assertLessEqual(report["p50_ms"], report["p99_ms"])
+
+    def test_replay_with_threads_and_processes(self):
+        """Concurrent replays account for every operation."""
+        for mode in ("thread", "process"):
+            trace = loadgen.generate_trace(loadgen.TraceShape(40), seed=2)
+            report = loadgen.replay(trace, self.data_dir, 2, mode)
+            self.assertEqual(report["operations"], 40)
+            self.assertEqual(report["mode"], mode)
+            self.assertGreater(report["io"]["reads"], 0)
+
+    def test_replay_restores_the_backend(self):
+        """The caller's backend is active again once replay returns."""
+        backend = storage.get_backend()
+        trace = loadgen.generate_trace(loadgen.TraceShape(10), seed=4)
+        loadgen.replay(trace, self.data_dir)
+        self.assertIs(storage.get_backend(), backend)
+        self.assertEqual(storage.data_dir(), DATA_DIR)
+
+    def test_replay_rejects_bad_arguments(self):
+        """replay validates the worker count and mode."""
+        with self.assertRaises(ValueError):
+            loadgen.replay([], self.data_dir, workers=0)
+        with self.assertRaises(ValueError):
+            loadgen.replay([], self.data_dir, mode="fiber")
+
+    def test_main_generate_and_replay(self):
+        """The command line writes and replays a trace."""
+        trace = os.path.join(self.tmp, "trace.jsonl")
+        self.assertEqual(
+            loadgen.main(["generate", trace, "--ops", "20", "--seed", "3"]),
+            0,
+        )
+        self.assertEqual(len(list(loadgen.read_trace(trace))), 75)
+        self.assertEqual(loadgen.main(["replay", trace, "--json"]), 0)
+        self.assertEqual(storage.data_dir(), DATA_DIR)
+        self.assertEqual(
+            loadgen.main(["replay", trace, "--data-dir", self.data_dir]),
+            0,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
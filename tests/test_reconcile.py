@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Unit tests for reconcile.py – room count consistency checks."""
+
+import unittest
+from unittest import mock
+from tests.helpers import clear_data
+from src import reconcile
+from src.customer import CustomerRepository
+from src.file_db import FileDB
+from src.hotel import HotelRepository
+from src.reservation import ReservationRepository
+
+
+class TestReconcile(unittest.TestCase):
+    """Tests for finding and repairing drifted room counts."""
+
+    def setUp(self):
+        """Clear data and book one of three rooms at H1."""
+        clear_data()
+        HotelRepository.create("H1", "Grand", "NYC", 3)
+        CustomerRepository.create("C1", "Alice", "a@test.com", "555")
+        ReservationRepository.create("C1", "H1")
+
+    def test_count_active_ignores_cancelled(self):
+        """count_active only counts active reservations."""
+        counts = reconcile.count_active([
+            {"hotel_id": "H1"},
+            {"hotel_id": "H1", "status": "cancelled"},
+            {"hotel_id": "H2", "status": "active"},
+        ])
+        self.assertEqual(counts, {"H1": 1, "H2": 1})
+
+    def test_consistent_data_has_no_mismatches(self):
+        """A normal booking flow leaves nothing to repair."""
+        self.assertEqual(reconcile.find_room_mismatches(), [])
+        self.assertEqual(reconcile.repair_room_counts(), 0)
+
+    def test_detects_and_repairs_drift(self):
+        """A lost hotel save is reported and repaired."""
+        HotelRepository.cancel("H1")
+        mismatches = reconcile.find_room_mismatches()
+        self.assertEqual(mismatches, [{"hotel_id": "H1", "recorded": 3,
+                                       "expected": 2,
+                                       "overbooked": False}])
+        self.assertEqual(reconcile.repair_room_counts(), 1)
+        self.assertEqual(HotelRepository.get("H1").available_rooms, 2)
+
+    def test_flags_overbooking(self):
+        """More active reservations than rooms is flagged as overbooked."""
+        HotelRepository.modify("H1", total_rooms=0)
+        reservations = FileDB.load_reservations_data()
+        reservations["X"] = {"reservation_id": "X", "customer_id": "C1",
+                             "hotel_id": "H1", "status": "active"}
+        FileDB.save_reservations_data(reservations)
+        hotels = FileDB.load_hotels_data()
+        hotels["H1"]["available_rooms"] = 1
+        FileDB.save_hotels_data(hotels)
+        mismatch = reconcile.find_room_mismatches()[0]
+        self.assertTrue(mismatch["overbooked"])
+        self.assertEqual(mismatch["expected"], 0)
+
+    def test_repair_skips_deleted_hotels(self):
+        """Mismatches for hotels deleted meanwhile are ignored."""
+        stale = [{"hotel_id": "GONE", "recorded": 1, "expected": 0,
+                  "overbooked": False}]
+        self.assertEqual(reconcile.repair_room_counts(stale), 0)
+
+    def test_repair_skips_hotels_changed_since_check(self):
+        """A stale expected value is not written over a newer count."""
+        HotelRepository.cancel("H1")
+        mismatches = reconcile.find_room_mismatches()
+        CustomerRepository.create("C2", "Bob", "b@test.com", "555")
+        ReservationRepository.create("C2", "H1")
+        self.assertEqual(reconcile.repair_room_counts(mismatches), 0)
+        self.assertEqual(HotelRepository.get("H1").available_rooms, 2)
+        self.assertEqual(reconcile.find_room_mismatches()[0]["expected"], 1)
+
+    def test_repair_uses_current_reservations(self):
+        """Counts are recomputed, not copied from the earlier check."""
+        HotelRepository.cancel("H1")
+        HotelRepository.cancel("H1")
+        mismatches = reconcile.find_room_mismatches()
+        reservations = FileDB.load_reservations_data()
+        reservations["X"] = {"reservation_id": "X", "customer_id": "C1",
+                             "hotel_id": "H1", "status": "active"}
+        FileDB.save_reservations_data(reservations)
+        self.assertEqual(reconcile.repair_room_counts(mismatches), 1)
+        self.assertEqual(HotelRepository.get("H1").available_rooms, 1)
+
+    def snapshot_then(self, write):
+        """Patch load_snapshot to run `write` right after snapshotting."""
+        real = FileDB.load_snapshot
+
+        def load_snapshot():
+            snapshot = real()
+            write()
+            return snapshot
+
+        return mock.patch.object(FileDB, "load_snapshot", load_snapshot)
+
+    def test_repair_keeps_writes_made_after_snapshot(self):
+        """Hotels saved after the snapshot are not reverted."""
+        HotelRepository.cancel("H1")
+
+        def write():
+            HotelRepository.create("H2", "Tiny", "LA", 1)
+            HotelRepository.reserve("H2")
+
+        with self.snapshot_then(write):
+            self.assertEqual(reconcile.repair_room_counts(), 1)
+        self.assertEqual(HotelRepository.get("H1").available_rooms, 2)
+        self.assertEqual(HotelRepository.get("H2").available_rooms, 0)
+
+    def test_repair_skips_hotel_changed_after_snapshot(self):
+        """A count that moved after the snapshot is left alone."""
+        HotelRepository.cancel("H1")
+        with self.snapshot_then(lambda: HotelRepository.reserve("H1")):
+            self.assertEqual(reconcile.repair_room_counts(), 0)
+        self.assertEqual(HotelRepository.get("H1").available_rooms, 2)
+
+    def test_main_fails_when_repair_skips_hotels(self):
+        """main reports failure if a mismatch could not be repaired."""
+        HotelRepository.cancel("H1")
+        with mock.patch.object(reconcile, "repair_room_counts",
+                               return_value=0):
+            self.assertEqual(reconcile.main(["--repair"]), 1)
+
+    def test_main_exit_codes(self):
+        """main fails on drift, and succeeds once repaired."""
+        self.assertEqual(reconcile.main([]), 0)
+        HotelRepository.cancel("H1")
+        self.assertEqual(reconcile.main([]), 1)
+        self.assertEqual(reconcile.main(["--repair"]), 0)
+        self.assertEqual(reconcile.main([]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
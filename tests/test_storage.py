@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Unit tests for storage.py – FileDB storage backends."""
+
+import os
+import threading
+import unittest
+from tests.helpers import DATA_DIR, clear_data
+from src import storage
+from src.archive import ReservationArchive
+from src.customer import CustomerRepository
+from src.file_db import FileDB
+from src.hotel import HotelRepository
+from src.reservation import ReservationRepository
+
+
+def reserve_in_other_thread(hotel_id):
+    """Reserve a room from a thread outside the caller's context."""
+    thread = threading.Thread(target=HotelRepository.reserve,
+                              args=(hotel_id,))
+    thread.start()
+    thread.join()
+
+
+class TestStorage(unittest.TestCase):
+    """Tests for the JSON file and in-memory backends."""
+
+    def setUp(self):
+        """Clear data before each test."""
+        clear_data()
+
+    def test_json_backend_uses_configured_root(self):
+        """Tables are written under the configured data directory."""
+        HotelRepository.create("H1", "Grand", "NYC", 3)
+        self.assertTrue(os.path.exists(os.path.join(DATA_DIR,
+                                                    "hotels.json")))
+
+    def test_json_backend_missing_table_is_empty(self):
+        """Loading a table that was never saved returns {}."""
+        backend = storage.JsonFileBackend(os.path.join(DATA_DIR, "none"))
+        self.assertEqual(backend.load("hotels"), {})
+        self.assertFalse(os.path.exists(backend.root))
+
+    def test_memory_backend_copies_on_load_and_save(self):
+        """Mutating loaded or saved mappings does not leak into storage."""
+        backend = storage.MemoryBackend()
+        data = {"H1": {"hotel_id": "H1"}}
+        backend.save("hotels", data)
+        data["H1"]["hotel_id"] = "changed"
+        backend.load("hotels")["H1"]["hotel_id"] = "changed"
+        self.assertEqual(backend.load("hotels"), {"H1": {"hotel_id": "H1"}})
+
+    def test_using_memory_backend_skips_filesystem(self):
+        """Repositories work entirely in memory inside `FileDB.using`."""
+        with FileDB.using(storage.MemoryBackend()) as backend:
+            HotelRepository.create("H1", "Grand", "NYC", 3)
+            CustomerRepository.create("C1", "Alice", "a@test.com", "555")
+            self.assertIsNotNone(ReservationRepository.create("C1", "H1"))
+            self.assertEqual(
+                FileDB.load_snapshot()["hotels"]["H1"]["available_rooms"],
+                2,
+            )
+            self.assertIn("H1", backend.tables["hotels"])
+        self.assertIsNone(HotelRepository.get("H1"))
+
+    def test_using_is_scoped_to_the_context(self):
+        """Other threads keep the process-wide backend."""
+        seen = []
+        with FileDB.using(storage.MemoryBackend()):
+            thread = threading.Thread(
+                target=lambda: seen.append(storage.data_dir())
+            )
+            thread.start()
+            thread.join()
+            self.assertIsNone(storage.data_dir())
+        self.assertEqual(seen, [DATA_DIR])
+
+    def test_use_memory_sets_process_default(self):
+        """use_memory switches the process-wide backend."""
+        FileDB.use_memory()
+        self.addCleanup(FileDB.use_data_dir, DATA_DIR)
+        self.assertIsInstance(storage.get_backend(), storage.MemoryBackend)
+
+    def test_memory_backend_has_no_archive(self):
+        """Archiving is refused without a data directory."""
+        with FileDB.using(storage.MemoryBackend()):
+            self.assertIsNone(ReservationArchive.directory())
+            self.assertEqual(ReservationArchive.segments(), [])
+            self.assertEqual(ReservationRepository.archive(), 0)
+
+    def test_io_stats_count_from_many_threads(self):
+        """Concurrent loads from one backend are all counted."""
+        backend = storage.MemoryBackend()
+
+        def load_many():
+            for _ in range(2000):
+                backend.load("customers")
+
+        threads = [threading.Thread(target=load_many) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(backend.stats["reads"], 8000)
+
+
+class TestSnapshots(unittest.TestCase):
+    """Tests for snapshot-isolated reads."""
+
+    def setUp(self):
+        """Clear data and create one hotel."""
+        clear_data()
+        HotelRepository.create("H1", "Grand", "NYC", 3)
+
+    def test_snapshot_ignores_later_writes(self):
+        """Reads inside a snapshot keep seeing the pinned version."""
+        with FileDB.snapshot():
+            reserve_in_other_thread("H1")
+            self.assertEqual(HotelRepository.get("H1").available_rooms, 3)
+        self.assertEqual(HotelRepository.get("H1").available_rooms, 2)
+
+    def test_snapshot_is_read_only(self):
+        """Saving inside a snapshot raises."""
+        with FileDB.snapshot():
+            with self.assertRaises(RuntimeError):
+                HotelRepository.reserve("H1")
+
+    def test_nested_snapshot_shares_version(self):
+        """A nested snapshot reuses the outer pinned version."""
+        with FileDB.snapshot() as outer:
+            with FileDB.snapshot() as inner:
+                self.assertIs(outer, inner)
+
+    def test_memory_snapshot(self):
+        """Memory backend snapshots are isolated from later saves."""
+        with FileDB.using(storage.MemoryBackend()):
+            HotelRepository.create("H1", "Grand", "NYC", 3)
+            pinned = storage.get_backend().pin(FileDB.TABLES)
+            HotelRepository.reserve("H1")
+            self.assertEqual(
+                pinned.load("hotels")["H1"]["available_rooms"], 3
+            )
+
+    def test_saves_publish_atomically(self):
+        """Concurrent readers never observe a partially written file."""
+        errors = []
+        stop = threading.Event()
+
+        def read_loop():
+            while not stop.is_set():
+                try:
+                    FileDB.load_hotels_data()
+                except ValueError as exc:
+                    errors.append(exc)
+
+        reader = threading.Thread(target=read_loop)
+        reader.start()
+        try:
+            for i in range(200):
+                HotelRepository.create(f"X{i}", "Grand", "NYC", 3)
+        finally:
+            stop.set()
+            reader.join()
+        self.assertEqual(errors, [])
+        leftovers = [n for n in os.listdir(DATA_DIR) if n.endswith(".tmp")]
+        self.assertEqual(leftovers, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Unit tests for transfer.py – NDJSON export and import."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from tests.helpers import clear_data
+from src import transfer
+from src.customer import CustomerRepository
+from src.file_db import FileDB
+from src.hotel import HotelRepository
+from src.reservation import ReservationRepository
+
+
+class TestTransfer(unittest.TestCase):
+    """Tests for exporting and importing all tables."""
+
+    def setUp(self):
+        """Clear data, seed one of each record and make a temp dir."""
+        clear_data()
+        HotelRepository.create("H1", "Grand", "NYC", 3)
+        CustomerRepository.create("C1", "Alice", "a@test.com", "555")
+        ReservationRepository.create("C1", "H1")
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+
+    def test_export_writes_one_line_per_record(self):
+        """export_ndjson writes every record of every table."""
+        counts = transfer.export_ndjson(self.tmp)
+        self.assertEqual(counts, {"customers": 1, "hotels": 1,
+                                  "reservations": 1, "waitlist": 0})
+        path = transfer.table_path(self.tmp, "hotels")
+        with open(path, "r", encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+    def test_round_trip_restores_data(self):
+        """import_ndjson restores exactly what was exported."""
+        before = FileDB.load_snapshot()
+        transfer.export_ndjson(self.tmp)
+        clear_data()
+        transfer.import_ndjson(self.tmp, batch_size=1)
+        self.assertEqual(FileDB.load_snapshot(), before)
+
+    def test_import_replace_and_merge(self):
+        """Without merge the table is replaced; with merge it is kept."""
+        transfer.export_ndjson(self.tmp)
+        HotelRepository.create("H2", "Tiny", "LA", 1)
+        transfer.import_ndjson(self.tmp, merge=True)
+        self.assertIn("H2", FileDB.load_hotels_data())
+        transfer.import_ndjson(self.tmp)
+        self.assertNotIn("H2", FileDB.load_hotels_data())
+
+    def test_import_skips_missing_tables(self):
+        """Tables without an NDJSON file are left untouched."""
+        transfer.export_ndjson(self.tmp)
+        os.remove(transfer.table_path(self.tmp, "customers"))
+        counts = transfer.import_ndjson(self.tmp)
+        self.assertNotIn("customers", counts)
+
+    def test_import_rejects_bad_batch_size(self):
+        """import_ndjson requires a positive batch size."""
+        with self.assertRaises(ValueError):
+            transfer.import_ndjson(self.tmp, batch_size=0)
+
+    def test_snapshot_gives_up_when_files_keep_changing(self):
+        """load_snapshot raises when every attempt races a writer."""
+        with mock.patch("src.storage.JsonFileBackend._is_current",
+                        return_value=False):
+            with self.assertRaises(RuntimeError):
+                FileDB.load_snapshot(retries=2)
+
+    def test_main_export_and_import(self):
+        """The command line runs both subcommands."""
+        self.assertEqual(transfer.main(["export", self.tmp]), 0)
+        self.assertEqual(
+            transfer.main(["import", self.tmp, "--batch-size", "5"]),
+            0,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Unit tests for waitlist.py and waitlisted reservations."""
+
+import unittest
+from tests.helpers import clear_data
+from src import reconcile, waitlist
+from src.customer import CustomerRepository
+from src.file_db import FileDB
+from src.hotel import HotelRepository
+from src.reservation import ReservationRepository
+
+
+class TestWaitlistHeap(unittest.TestCase):
+    """Tests for the waitlist heap helpers."""
+
+    def test_pop_orders_by_priority_then_arrival(self):
+        """Lower priority wins; equal priorities are served FIFO."""
+        waitlists = {}
+        waitlist.push(waitlists, "H1", "late", priority=1, arrival=1)
+        waitlist.push(waitlists, "H1", "second", priority=0, arrival=3)
+        waitlist.push(waitlists, "H1", "first", priority=0, arrival=2)
+        order = [waitlist.pop(waitlists, "H1") for _ in range(3)]
+        self.assertEqual(order, ["first", "second", "late"])
+        self.assertIsNone(waitlist.pop(waitlists, "H1"))
+        self.assertEqual(waitlists, {})
+
+    def test_remove(self):
+        """remove drops one entry and keeps the heap usable."""
+        waitlists = {}
+        for i, name in enumerate(["a", "b", "c"]):
+            waitlist.push(waitlists, "H1", name, arrival=i)
+        self.assertTrue(waitlist.remove(waitlists, "H1", "a"))
+        self.assertFalse(waitlist.remove(waitlists, "H1", "a"))
+        self.assertFalse(waitlist.remove(waitlists, "H2", "a"))
+        self.assertEqual(waitlist.size(waitlists, "H1"), 2)
+        self.assertEqual(waitlist.pop(waitlists, "H1"), "b")
+        self.assertTrue(waitlist.remove(waitlists, "H1", "c"))
+        self.assertEqual(waitlist.size(waitlists, "H1"), 0)
+
+
+class TestWaitlistedReservations(unittest.TestCase):
+    """Tests for waitlisting and promotion in ReservationRepository."""
+
+    def setUp(self):
+        """Clear data and create a one-room hotel and two customers."""
+        clear_data()
+        HotelRepository.create("H1", "Tiny", "LA", 1)
+        CustomerRepository.create("C1", "Alice", "a@test.com", "555")
+        CustomerRepository.create("C2", "Bob", "b@test.com", "556")
+        self.booked = ReservationRepository.create("C1", "H1")
+
+    def test_sold_out_without_waitlist_returns_none(self):
+        """Waitlisting is opt-in."""
+        self.assertIsNone(ReservationRepository.create("C2", "H1"))
+        self.assertEqual(FileDB.load_waitlist_data(), {})
+
+    def test_sold_out_with_waitlist(self):
+        """A sold-out booking is stored as waitlisted."""
+        r = ReservationRepository.create("C2", "H1", allow_waitlist=True)
+        self.assertEqual(r.status, "waitlisted")
+        self.assertEqual(
+            ReservationRepository.get(r.reservation_id).status,
+            "waitlisted",
+        )
+        self.assertEqual(
+            waitlist.size(FileDB.load_waitlist_data(), "H1"), 1
+        )
+
+    def test_cancel_promotes_head_of_waitlist(self):
+        """The room passes to the best waitlisted booking."""
+        low = ReservationRepository.create("C2", "H1", allow_waitlist=True,
+                                           priority=5)
+        high = ReservationRepository.create("C1", "H1", allow_waitlist=True,
+                                            priority=1)
+        ReservationRepository.cancel(self.booked.reservation_id)
+        self.assertEqual(
+            ReservationRepository.get(high.reservation_id).status, "active"
+        )
+        self.assertEqual(
+            ReservationRepository.get(low.reservation_id).status,
+            "waitlisted",
+        )
+        self.assertEqual(HotelRepository.get("H1").available_rooms, 0)
+
+    def test_cancel_waitlisted_leaves_rooms_alone(self):
+        """Cancelling a waitlisted booking only leaves the queue."""
+        r = ReservationRepository.create("C2", "H1", allow_waitlist=True)
+        self.assertTrue(ReservationRepository.cancel(r.reservation_id))
+        self.assertEqual(FileDB.load_waitlist_data(), {})
+        ReservationRepository.cancel(self.booked.reservation_id)
+        self.assertEqual(HotelRepository.get("H1").available_rooms, 1)
+
+    def test_promotion_skips_stale_entries(self):
+        """Entries whose reservation vanished are skipped."""
+        r = ReservationRepository.create("C2", "H1", allow_waitlist=True)
+        waitlists = FileDB.load_waitlist_data()
+        waitlist.push(waitlists, "H1", "GONE", priority=-1)
+        FileDB.save_waitlist_data(waitlists)
+        ReservationRepository.cancel(self.booked.reservation_id)
+        self.assertEqual(
+            ReservationRepository.get(r.reservation_id).status, "active"
+        )
+
+    def test_added_rooms_go_to_waitlist_first(self):
+        """Raising total_rooms promotes the queue before new bookings."""
+        CustomerRepository.create("C3", "Carol", "c@test.com", "557")
+        waiting = ReservationRepository.create("C2", "H1",
+                                               allow_waitlist=True)
+        hotel = HotelRepository.modify("H1", total_rooms=2)
+        self.assertEqual(hotel.available_rooms, 0)
+        self.assertEqual(
+            ReservationRepository.get(waiting.reservation_id).status,
+            "active",
+        )
+        late = ReservationRepository.create("C3", "H1", allow_waitlist=True)
+        self.assertEqual(late.status, "waitlisted")
+
+    def test_create_queues_behind_waitlist(self):
+        """A free room is not taken past people already waiting."""
+        waiting = ReservationRepository.create("C2", "H1",
+                                               allow_waitlist=True)
+        hotels = FileDB.load_hotels_data()
+        hotels["H1"]["available_rooms"] = 1
+        FileDB.save_hotels_data(hotels)
+        self.assertIsNone(ReservationRepository.create("C1", "H1"))
+        self.assertEqual(
+            ReservationRepository.get(waiting.reservation_id).status,
+            "active",
+        )
+        self.assertEqual(HotelRepository.get("H1").available_rooms, 0)
+
+    def test_stale_queue_does_not_block_bookings(self):
+        """Entries of vanished reservations do not hold rooms back."""
+        ReservationRepository.cancel(self.booked.reservation_id)
+        waitlists = FileDB.load_waitlist_data()
+        waitlist.push(waitlists, "H1", "GONE")
+        FileDB.save_waitlist_data(waitlists)
+        r = ReservationRepository.create("C2", "H1")
+        self.assertEqual(r.status, "active")
+        self.assertEqual(FileDB.load_waitlist_data(), {})
+
+    def test_hotel_cancel_promotes(self):
+        """A room handed back directly goes to the waitlist."""
+        waiting = ReservationRepository.create("C2", "H1",
+                                               allow_waitlist=True)
+        self.assertTrue(HotelRepository.cancel("H1"))
+        self.assertEqual(
+            ReservationRepository.get(waiting.reservation_id).status,
+            "active",
+        )
+        self.assertEqual(HotelRepository.get("H1").available_rooms, 0)
+
+    def test_repair_promotes_into_freed_rooms(self):
+        """Rooms recovered by reconcile go to the waitlist."""
+        waiting = ReservationRepository.create("C2", "H1",
+                                               allow_waitlist=True)
+        reservations = FileDB.load_reservations_data()
+        reservations[self.booked.reservation_id]["status"] = "cancelled"
+        FileDB.save_reservations_data(reservations)
+        self.assertEqual(reconcile.repair_room_counts(), 1)
+        self.assertEqual(
+            ReservationRepository.get(waiting.reservation_id).status,
+            "active",
+        )
+        self.assertEqual(HotelRepository.get("H1").available_rooms, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()